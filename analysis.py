@@ -1,14 +1,199 @@
 import numpy as np
+from fields import active_field
+
+######################
+## Settings
+######################
+# Points every path is resampled to before paths are compared
+RESAMPLE_POINTS = 32
 
 
 class AnalysisObject:
 
     def __init__(self, events):
+        # events: flattened event list DataFrame (name, npos.x, npos.y, time)
         self.events = events
 
+    @staticmethod
     def distance(pos0, pos1) -> np.double:
-        return np.sqrt((pos0.x-pos1.x)^2 + (pos0.y-pos1.y)^2)
+        return np.sqrt((pos0[0]-pos1[0])**2 + (pos0[1]-pos1[1])**2)
+
+    def event_distance(self, e0, e1) -> np.double:
+        path = self.path()
+        return self.distance(path[e0], path[e1])
+
+    def path(self):
+        # Event positions in field coordinates, in time order, shape (n, 2)
+        if self.events is None or self.events.shape[0] == 0:
+            return np.zeros((0, 2))
+        events = self.events
+        if "time" in events:
+            events = events.sort_values("time", kind="stable")
+        x, y = active_field().to_pixels(events["npos.x"], events["npos.y"])
+        path = np.column_stack([x, y])
+        return path[~np.isnan(path).any(axis=1)]
+
+    def resample(self, n=RESAMPLE_POINTS):
+        # n points evenly spaced along the path length, shape (n, 2)
+        path = self.path()
+        if path.shape[0] == 0:
+            return None
+        if path.shape[0] == 1:
+            return np.repeat(path, n, axis=0)
+
+        seg = np.sqrt((np.diff(path, axis=0)**2).sum(axis=1))
+        s = np.concatenate([[0], np.cumsum(seg)])
+        if s[-1] == 0:
+            return np.repeat(path[:1], n, axis=0)
+        s_new = np.linspace(0, s[-1], n)
+        return np.column_stack([np.interp(s_new, s, path[:, 0]),
+                                np.interp(s_new, s, path[:, 1])])
+
+
+######################
+## Path clustering
+######################
+def dtw_distance_matrix(paths):
+    # Pairwise dynamic time warping distance between resampled paths of
+    # shape (P, N, 2). All pairs are solved together: the DP runs once over
+    # the N x N grid with every step vectorized over the pairs.
+    paths = np.asarray(paths, dtype=np.double)
+    npaths, n = paths.shape[0], paths.shape[1]
+    dist = np.zeros((npaths, npaths))
+    if npaths < 2:
+        return dist
+
+    ia, ib = np.triu_indices(npaths, k=1)
+    a = paths[ia]
+    b = paths[ib]
+    # cost[p, i, j] = |a[p, i] - b[p, j]|
+    cost = np.sqrt(((a[:, :, None, :] - b[:, None, :, :])**2).sum(axis=3))
+
+    acc = np.full((ia.shape[0], n+1, n+1), np.inf)
+    acc[:, 0, 0] = 0
+    for i in range(1, n+1):
+        for j in range(1, n+1):
+            acc[:, i, j] = cost[:, i-1, j-1] + np.minimum(
+                np.minimum(acc[:, i-1, j], acc[:, i, j-1]), acc[:, i-1, j-1])
+
+    # Average cost per step so the distance stays in field units
+    d = acc[:, n, n] / (2*n)
+    dist[ia, ib] = d
+    dist[ib, ia] = d
+    return dist
+
+
+def k_medoids(dist, k, n_iter=100):
+    # Alternating k-medoids on a precomputed distance matrix.
+    # Returns (labels, medoid indices).
+    npaths = dist.shape[0]
+    k = min(k, npaths)
+
+    # Deterministic farthest-first start from the most central path
+    medoids = [int(np.argmin(dist.sum(axis=1)))]
+    while len(medoids) < k:
+        medoids.append(int(np.argmax(dist[:, medoids].min(axis=1))))
+    medoids = np.array(medoids)
+
+    for _ in range(n_iter):
+        labels = np.argmin(dist[:, medoids], axis=1)
+        new_medoids = medoids.copy()
+        for c in range(k):
+            members = np.flatnonzero(labels == c)
+            if members.shape[0] == 0:
+                continue
+            within = dist[np.ix_(members, members)].sum(axis=1)
+            new_medoids[c] = members[np.argmin(within)]
+        if np.array_equal(new_medoids, medoids):
+            break
+        medoids = new_medoids
+
+    labels = np.argmin(dist[:, medoids], axis=1)
+    return labels, medoids
+
+
+def silhouette(dist, labels):
+    npaths = dist.shape[0]
+    clusters = np.unique(labels)
+    if clusters.shape[0] < 2 or clusters.shape[0] >= npaths:
+        return -1.0
+
+    # summed distance from every path to every cluster, shape (P, k)
+    onehot = (labels[:, None] == clusters[None, :]).astype(np.double)
+    sizes = onehot.sum(axis=0)
+    sum_to = dist @ onehot
+    own = labels[:, None] == clusters[None, :]
+
+    own_size = sizes[np.argmax(own, axis=1)]
+    a = np.where(own_size > 1, sum_to[own] / np.maximum(own_size-1, 1), 0)
+    b = np.where(own, np.inf, sum_to / sizes).min(axis=1)
+    s = np.where(own_size > 1, (b-a) / np.maximum(np.maximum(a, b), 1e-9), 0)
+    return float(s.mean())
+
+
+def cluster_paths(paths, max_k=4):
+    # Group a team's resampled auto paths into routines. k is picked from
+    # 1..max_k by silhouette score. Returns (labels, medoids, dist).
+    if len(paths) == 0:
+        # e.g. a teleop-only team: no routines
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros((0, 0))
+    dist = dtw_distance_matrix(paths)
+    npaths = dist.shape[0]
+    if npaths < 3:
+        return np.zeros(npaths, dtype=int), np.array([0] if npaths > 0 else [], dtype=int), dist
+
+    best = None
+    for k in range(2, min(max_k, npaths-1)+1):
+        labels, medoids = k_medoids(dist, k)
+        score = silhouette(dist, labels)
+        if best is None or score > best[0]:
+            best = (score, labels, medoids)
+
+    # Paths that all look alike stay one routine
+    if best is None or best[0] < 0.25:
+        labels, medoids = k_medoids(dist, 1)
+        return labels, medoids, dist
+    return best[1], best[2], dist
+
+
+######################
+## Path similarity search
+######################
+class PathIndex:
+    # Nearest-neighbour search over fixed-length path embeddings (resampled
+    # field coordinates). Distances are the RMS point-to-point distance in
+    # field units, computed for every stored path in one matrix product.
+
+    def __init__(self, keys, paths):
+        self.keys = list(keys)
+        paths = np.asarray(paths, dtype=np.float32)
+        self.npoints = paths.shape[1] if paths.ndim == 3 else RESAMPLE_POINTS
+        self.embeddings = paths.reshape(paths.shape[0], -1) if paths.shape[0] > 0 else np.zeros((0, 2*self.npoints), dtype=np.float32)
+        self.sq_norms = (self.embeddings.astype(np.double)**2).sum(axis=1)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _distances(self, path):
+        q = np.asarray(path, dtype=np.float32).reshape(-1)
+        d2 = self.sq_norms - 2*(self.embeddings @ q) + (q.astype(np.double)**2).sum()
+        return np.sqrt(np.maximum(d2, 0) / self.npoints)
 
-    def event_distance(e0, e1) -> np.double:
-        pass
+    def query(self, path, k=10, mirror=True, exclude=None):
+        # Returns [(key, distance)] of the k closest paths. With mirror, the
+        # path driven from the other alliance station also matches.
+        if len(self.keys) == 0 or path is None:
+            return []
+        dist = self._distances(path)
+        if mirror:
+            flipped = np.array(path, dtype=np.double)
+            flipped[:, 0] = active_field().mirror_x(flipped[:, 0])
+            dist = np.minimum(dist, self._distances(flipped))
+        if exclude is not None:
+            dist = dist.copy()
+            dist[[i for i, key in enumerate(self.keys) if key == exclude]] = np.inf
 
+        k = min(k, dist.shape[0])
+        nearest = np.argpartition(dist, k-1)[:k]
+        nearest = nearest[np.argsort(dist[nearest])]
+        return [(self.keys[i], float(dist[i])) for i in nearest if np.isfinite(dist[i])]
@@ -0,0 +1,98 @@
+// Clientside callbacks for the match playback controls. The server sends the
+// match once as compact arrays (playback-data store); every frame below is
+// computed in the browser, so playing a match costs no server round trips.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    playback: {
+        toggle: function(n_clicks, disabled, value, data) {
+            if (!n_clicks) {
+                return [true, "Play", window.dash_clientside.no_update];
+            }
+            if (disabled) {
+                // Restart from the beginning when play is pressed at the end
+                var restart = (data && data.t.length > 0 && value >= data.tmax) ? data.tmin : window.dash_clientside.no_update;
+                return [false, "Pause", restart];
+            }
+            return [true, "Play", window.dash_clientside.no_update];
+        },
+
+        tick: function(n_intervals, value, data, interval) {
+            if (!data || data.t.length === 0) {
+                return [window.dash_clientside.no_update, true, "Play"];
+            }
+            var next = value + interval / 1000.0;
+            if (next >= data.tmax) {
+                return [data.tmax, true, "Play"];
+            }
+            return [next, false, "Pause"];
+        },
+
+        render: function(value, data, figure) {
+            if (!figure || !data) {
+                return window.dash_clientside.no_update;
+            }
+            var playing = data.t.length > 0 && value < data.tmax;
+            var shown = (figure.data || []).some(function(trace) {
+                return trace.name === "Playback" || trace.name === "Robot";
+            });
+            if (!playing && !shown) {
+                // Nothing to undo; leave the server-drawn figure alone
+                return window.dash_clientside.no_update;
+            }
+
+            var fig = Object.assign({}, figure);
+            fig.data = (figure.data || []).filter(function(trace) {
+                return trace.name !== "Playback" && trace.name !== "Robot";
+            });
+            fig.layout = Object.assign({}, figure.layout);
+
+            // Arrow i joins table rows i and i+1; only show the ones already driven
+            fig.layout.annotations = (figure.layout.annotations || []).map(function(arrow, i) {
+                var visible = !playing || data.t[i + 1] <= value;
+                return Object.assign({}, arrow, {visible: visible});
+            });
+            fig.data = fig.data.map(function(trace) {
+                return Object.assign({}, trace, {opacity: playing ? 0.15 : 1.0});
+            });
+            if (!playing) {
+                return fig;
+            }
+
+            var x = [], y = [], colors = [];
+            for (var i = 0; i < data.t.length; i++) {
+                if (data.t[i] <= value && data.name[i] !== "move") {
+                    x.push(data.x[i]);
+                    y.push(data.y[i]);
+                    colors.push(data.color[i]);
+                }
+            }
+            fig.data.push({
+                type: "scatter", mode: "markers", name: "Playback",
+                x: x, y: y, hoverinfo: "none",
+                marker: {symbol: "0", size: 15, color: colors}
+            });
+
+            // Robot position interpolated along the time-sorted path
+            var order = data.order;
+            var rx = data.x[order[0]], ry = data.y[order[0]];
+            for (var k = 1; k < order.length; k++) {
+                var i0 = order[k - 1], i1 = order[k];
+                if (data.t[i1] >= value) {
+                    var dt = data.t[i1] - data.t[i0];
+                    var f = dt > 0 ? (value - data.t[i0]) / dt : 1.0;
+                    f = Math.max(0.0, Math.min(1.0, f));
+                    rx = data.x[i0] + f * (data.x[i1] - data.x[i0]);
+                    ry = data.y[i0] + f * (data.y[i1] - data.y[i0]);
+                    break;
+                }
+                rx = data.x[i1];
+                ry = data.y[i1];
+            }
+            fig.data.push({
+                type: "scatter", mode: "markers", name: "Robot",
+                x: [rx], y: [ry], hoverinfo: "none",
+                marker: {symbol: "square", size: 20, color: "yellow", line: {color: "black", width: 2}}
+            });
+            return fig;
+        }
+    }
+});
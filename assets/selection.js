@@ -0,0 +1,68 @@
+// Linked selection between the event table and the field. Both directions
+// run in the browser: a selection change only rewrites the small
+// "Selection" overlay trace instead of rebuilding the figure on the server.
+// The server sends the figure and playback-data in the same response, so
+// the figure read here always matches the x/y arrays.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    selection: {
+        highlight: function(selected, data, figure) {
+            if (!figure || !data) {
+                return window.dash_clientside.no_update;
+            }
+            var fig = Object.assign({}, figure);
+            fig.data = (figure.data || []).filter(function(trace) {
+                return trace.name !== "Selection" && trace.name !== "Selection path";
+            });
+
+            // Selected events plus the path segment that led to each of them
+            var x = [], y = [], px = [], py = [];
+            (selected || []).forEach(function(i) {
+                if (i >= data.x.length) {
+                    return;
+                }
+                x.push(data.x[i]);
+                y.push(data.y[i]);
+                if (i > 0) {
+                    px.push(data.x[i - 1], data.x[i], null);
+                    py.push(data.y[i - 1], data.y[i], null);
+                }
+            });
+            if (x.length === 0 && fig.data.length === (figure.data || []).length) {
+                return window.dash_clientside.no_update;
+            }
+            if (x.length > 0) {
+                fig.data.push({
+                    type: "scatter", mode: "lines", name: "Selection path",
+                    x: px, y: py, hoverinfo: "none",
+                    line: {color: "yellow", width: 4}
+                });
+                fig.data.push({
+                    type: "scatter", mode: "markers", name: "Selection",
+                    x: x, y: y, hoverinfo: "none",
+                    marker: {symbol: "circle-open", size: 24, color: "yellow", line: {width: 3}}
+                });
+            }
+            return fig;
+        },
+
+        select: function(clickData, selected_rows, indices) {
+            if (!clickData || !indices) {
+                return window.dash_clientside.no_update;
+            }
+            var point = clickData.points[0];
+            if (point.customdata === undefined || point.customdata === null) {
+                return window.dash_clientside.no_update;
+            }
+            // customdata is the row's position in the table's current order
+            var row = indices[point.customdata];
+            var rows = (selected_rows || []).slice();
+            var at = rows.indexOf(row);
+            if (at >= 0) {
+                rows.splice(at, 1);
+            } else {
+                rows.push(row);
+            }
+            return rows;
+        }
+    }
+});
@@ -0,0 +1,97 @@
+import threading
+
+# Position-weighted sum over what the catalog reads from each row. Any edit,
+# delete or insert among already loaded rows changes it.
+ROW_CHECKSUM = ("((rowid % 997) + 1) * (COALESCE(Team, 0)*100003 + COALESCE(Match, 0)*101"
+                " + (AutoEventList IS NOT NULL) + (TeleEventList IS NOT NULL)*2 + 1)")
+
+######################
+## Team/Match Catalog
+######################
+class MatchCatalog:
+    # In-memory index of what is in the scouting database: every team, its
+    # sorted matches, and which stages of each match have event data. It is
+    # built with one grouped query and afterwards only picks up the rows the
+    # scouting app appended since the last refresh, as long as the rows it
+    # already loaded are unchanged (checked with ROW_CHECKSUM).
+
+    def __init__(self, read_sql, version):
+        self.read_sql = read_sql
+        self.version = version
+        self.data_version = None
+        self.teams = []
+        # {team: {match: {"Auto": bool, "Teleop": bool}}}
+        self.matches = {}
+        self.sorted_matches = {}
+        self.checksum = None
+        self.last_rowid = 0
+        self._lock = threading.Lock()
+
+    def _load(self, where=""):
+        # NULLs are filtered in SQL: pandas would read them as NaN and turn
+        # the whole column (and every team) into floats
+        df = self.read_sql(
+            "SELECT Team, Match, "
+            "MAX(AutoEventList IS NOT NULL) AS has_auto, "
+            "MAX(TeleEventList IS NOT NULL) AS has_tele "
+            f"FROM match WHERE Team IS NOT NULL AND Match IS NOT NULL {where} GROUP BY Team, Match")
+        changed = set()
+        for team, match, has_auto, has_tele in df[["Team", "Match", "has_auto", "has_tele"]].itertuples(index=False):
+            stages = self.matches.setdefault(team, {}).setdefault(match, {"Auto": False, "Teleop": False})
+            stages["Auto"] = stages["Auto"] or bool(has_auto)
+            stages["Teleop"] = stages["Teleop"] or bool(has_tele)
+            changed.add(team)
+
+        for team in changed:
+            self.sorted_matches[team] = sorted(self.matches[team])
+        self.teams = sorted(self.matches)
+
+    def refresh(self, data_version=None):
+        if data_version is None:
+            data_version = self.version()
+
+        stats = self.read_sql(
+            "SELECT COALESCE(MAX(rowid), 0) AS last_rowid, "
+            f"COALESCE(SUM(CASE WHEN rowid <= {self.last_rowid} THEN {ROW_CHECKSUM} END), 0) AS loaded_checksum, "
+            f"COALESCE(SUM({ROW_CHECKSUM}), 0) AS checksum "
+            "FROM match")
+        last_rowid = int(stats["last_rowid"].iloc[0])
+        loaded_checksum = int(stats["loaded_checksum"].iloc[0])
+        checksum = int(stats["checksum"].iloc[0])
+
+        if self.checksum is not None and loaded_checksum == self.checksum:
+            if last_rowid > self.last_rowid:
+                # Only new rows were appended, merge them in
+                self._load(f"AND rowid > {self.last_rowid}")
+        else:
+            # First build, or rows were edited/deleted in place
+            self.matches = {}
+            self.sorted_matches = {}
+            self._load()
+
+        self.checksum = checksum
+        self.last_rowid = last_rowid
+        self.data_version = data_version
+
+    def get(self):
+        data_version = self.version()
+        if data_version != self.data_version:
+            with self._lock:
+                if data_version != self.data_version:
+                    self.refresh(data_version)
+        return self
+
+    def team_options(self):
+        return [{"label": team, "value": team} for team in self.teams]
+
+    def match_options(self, team, stage=None):
+        # Matches without data for the selected stage are shown disabled
+        team_matches = self.matches.get(team, {})
+        return [{"label": match, "value": match,
+                 "disabled": stage is not None and not team_matches[match][stage]}
+                for match in self.sorted_matches.get(team, [])]
+
+    def stage_options(self, team, match):
+        stages = self.matches.get(team, {}).get(match, {"Auto": True, "Teleop": True})
+        return [{"label": stage, "value": stage, "disabled": not has_data}
+                for stage, has_data in stages.items()]
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from events import EVENT_CODES
+from fields import active_field
+
+######################
+## Settings
+######################
+# A cycle starts when a piece is acquired (init = preloaded piece) and ends
+# with the first event that gets rid of it
+CYCLE_START = ["init", "pickup"]
+CYCLE_END = ["scoreSpeaker", "missSpeaker", "scoreAmp", "missAmp", "drop"]
+SCORED = ["scoreSpeaker", "scoreAmp"]
+
+CYCLE_COLUMNS = ["start", "end", "duration", "distance", "start_event", "outcome", "scored"]
+STAT_COLUMNS = ["cycles", "median", "mean", "p25", "p75", "score_rate", "distance"]
+
+_START_CODES = np.array([EVENT_CODES[name] for name in CYCLE_START], dtype=np.int8)
+_END_CODES = np.array([EVENT_CODES[name] for name in CYCLE_END], dtype=np.int8)
+_SCORED_CODES = np.array([EVENT_CODES[name] for name in SCORED], dtype=np.int8)
+_CODE_NAMES = {code: name for name, code in EVENT_CODES.items()}
+
+
+######################
+## Cycle Extraction
+######################
+def extract_cycles(batch):
+    # EventBatch -> one row per cycle. Each end event is paired with the
+    # latest start before it, and each start keeps only its first end, so
+    # the whole match is a couple of searchsorted calls instead of a state
+    # machine stepping through the events.
+    array = batch.array
+    if array.shape[0] == 0:
+        return pd.DataFrame(columns=CYCLE_COLUMNS)
+    array = array[np.argsort(array["time"], kind="stable")]
+    code = array["code"]
+
+    starts = np.flatnonzero(np.isin(code, _START_CODES))
+    ends = np.flatnonzero(np.isin(code, _END_CODES))
+    if starts.shape[0] == 0 or ends.shape[0] == 0:
+        return pd.DataFrame(columns=CYCLE_COLUMNS)
+
+    owner = np.searchsorted(starts, ends, side="right") - 1
+    ends = ends[owner >= 0]
+    owner = starts[owner[owner >= 0]]
+    # ends are sorted, so return_index picks each start's first end
+    start_idx, first = np.unique(owner, return_index=True)
+    end_idx = ends[first]
+
+    # Travel along the scouted path between the two events
+    x, y = active_field().to_pixels(array["x"], array["y"])
+    step = np.nan_to_num(np.hypot(np.diff(x), np.diff(y)))
+    travelled = np.concatenate([[0], np.cumsum(step)])
+
+    t = array["time"].astype(np.double)
+    return pd.DataFrame({
+        "start": t[start_idx],
+        "end": t[end_idx],
+        "duration": t[end_idx] - t[start_idx],
+        "distance": travelled[end_idx] - travelled[start_idx],
+        "start_event": [_CODE_NAMES.get(c, "unknown") for c in code[start_idx]],
+        "outcome": [_CODE_NAMES.get(c, "unknown") for c in code[end_idx]],
+        "scored": np.isin(code[end_idx], _SCORED_CODES),
+    })
+
+
+def cycle_stats(cycles, by=None):
+    # Cycle time distribution summary, overall or per `by` column(s)
+    if cycles.shape[0] == 0:
+        return pd.DataFrame(columns=([by] if isinstance(by, str) else list(by or [])) + STAT_COLUMNS)
+
+    def summarize(group):
+        duration = group["duration"]
+        return pd.Series({
+            "cycles": duration.shape[0],
+            "median": duration.median(),
+            "mean": duration.mean(),
+            "p25": duration.quantile(0.25),
+            "p75": duration.quantile(0.75),
+            "score_rate": group["scored"].mean(),
+            "distance": group["distance"].mean(),
+        })
+
+    if by is None:
+        return summarize(cycles).to_frame().T[STAT_COLUMNS].astype({"cycles": int})
+    return cycles.groupby(by).apply(summarize)[STAT_COLUMNS].astype({"cycles": int}).reset_index()
@@ -3,10 +3,9 @@ import plotly.express as px
 import pandas as pd
 import plotly.graph_objects as go
 
-df = pd.read_csv('https://raw.githubusercontent.com/plotly/datasets/master/gapminder_unfiltered.csv')
-
 import numpy as np
 import plotly.graph_objects as go
+from geometry import ellipse_arc
 
 
 app = Dash(__name__,
@@ -19,23 +18,6 @@ app = Dash(__name__,
 def draw_plotly_court(fig, fig_width=500, fig_height=870, margins=10, lwidth=3,
                       show_title=True, labelticks=True, show_axis=True,
                       glayer='below', bg_color='white'):
-    # From: https://community.plot.ly/t/arc-shape-with-path/7205/5
-    def ellipse_arc(x_center=0.0, y_center=0.0, a=10.5, b=10.5,
-                    start_angle=0.0, end_angle=2 * np.pi, N=200,
-                    closed=False, opposite=False):
-        t = np.linspace(start_angle, end_angle, N)
-        x = x_center + a * np.cos(t)
-        if opposite:
-            y = y_center + b * np.sin(-t)
-        else:
-            y = y_center + b * np.sin(t)
-        path = f'M {x[0]}, {y[0]}'
-        for k in range(1, len(t)):
-            path += f'L{x[k]}, {y[k]}'
-        if closed:
-            path += ' Z'
-        return path
-
     ####################################################################
     ############################ dimensions ############################
     #  half-court -52.5 <= y <= 417.5, full-court -52.5 <= y <= 887.5  #
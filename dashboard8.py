@@ -1,5 +1,8 @@
-from dash import Dash, html, dcc, callback, Output, Input, dash_table
-import plotly.express as px
+import time
+startup_t0 = time.perf_counter()
+
+from dash import Dash, html, dcc, callback, ctx, no_update, Output, Input, State, dash_table, DiskcacheManager, ClientsideFunction
+import diskcache
 import pandas as pd
 import plotly.graph_objects as go
 import dash_bootstrap_components as dbc
@@ -9,13 +12,37 @@ from dash_bootstrap_templates import load_figure_template
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import scoped_session, sessionmaker, Query
 import json
+from events import parse_events, parse_event_list, reconcile_event_lists, EventBatch, EVENT_COLORS
+import event_cache
+from catalog import MatchCatalog
+import os
+import functools
+from analysis import AnalysisObject, cluster_paths, PathIndex
+from zones import classify_zones, zone_summary
+import fields
+from fields import active_field
+import shared_cache
+from shot_chart import hexbin, shot_events, HEX_SIZE
+from cycles import extract_cycles, cycle_stats
+from sequence_index import EventSequenceIndex, parse_pattern
+from timebase import timed_paths, time_grid
+from federation import Federation, discover_databases
 
 ######################
 ## Setup Dash
 ######################
 load_figure_template("darkly")
+
+# Heavy aggregations (heatmap, routines, shot chart, cycles, similar paths)
+# run as background callbacks in their own processes so the Flask threads
+# stay free for the dropdown callbacks. diskcache needs no
+# external broker, so this also works offline at the venue.
+background_callback_manager = DiskcacheManager(
+    diskcache.Cache(os.path.join(event_cache.CACHE_DIR, "callbacks")))
+
 app = Dash(__name__,
             external_stylesheets=[dbc.themes.DARKLY],
+            background_callback_manager=background_callback_manager,
             suppress_callback_exceptions=True,
             meta_tags=[{'name': 'viewport',
                         'content': 'width=device-width, initial-scale=1.0'}],
@@ -25,28 +52,32 @@ app = Dash(__name__,
 ## Setup DB
 ######################
 server = app.server
-server.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{server.root_path}/../AdvantageScout/data_2024.db"
+# One DB per event: DASHBOARD_DB takes several paths/globs (optionally name=path)
+# separated by os.pathsep
+databases = discover_databases(os.environ.get("DASHBOARD_DB", f"{server.root_path}/../AdvantageScout/data_2024.db"))
+
+# Field geometry follows the DB season (data_<season>.db) unless overridden;
+# DBs of other seasons are skipped with an error
+season, databases = fields.single_season(databases, os.environ.get("DASHBOARD_SEASON"))
+fields.set_active_season(season)
+
+Federation.configure(server, databases)
 db = SQLAlchemy(server)
-# reflect the tables
-with app.server.app_context(): 
-    db.Model.metadata.reflect(db.engine)
+federation = Federation(server, db, databases)
+db_path = databases[federation.default_event]
+
+# Fast start leaves the event cache warm-up to first use. Set
+# DASHBOARD_FAST_START=0 to load the cached events at import instead
+fast_start = os.environ.get("DASHBOARD_FAST_START", "1") != "0"
 
-class Match(db.Model):
-    __table__ = db.Model.metadata.tables['match']
+if not fast_start:
+    # load the parsed events cached on disk by earlier runs
+    event_cache.preload()
 
 ######################
 ## Helper Objects
 ######################
-event_colors = {
-    "scoreSpeaker" : "#00FF00",
-    "missSpeaker" : "red",
-    "scoreAmp" : "blue",
-    "missAmp" : "purple",
-    "move" : "white",
-    "pickup" : "orange",
-    "drop" : "black",
-    "init" : "cyan"
-}
+event_colors = EVENT_COLORS
 
 ######################
 ## Helper Functions
@@ -54,174 +85,81 @@ event_colors = {
 def draw_plotly_field(fig, fig_width=600, fig_height=300, margins=30, lwidth=3,
                       show_title=True, labelticks=True, show_axis=True,
                       glayer='below', bg_color='white'):
+    # Layout comes precompiled from the active season's field definition
+    fig.update_layout(active_field().layout(fig_width=fig_width, fig_height=fig_height, margins=margins,
+                                            lwidth=lwidth, labelticks=labelticks, show_axis=show_axis,
+                                            glayer=glayer, bg_color=bg_color))
+    return True
 
+def db_version(event=None):
+    # Changes whenever the scouting app writes to the database (any DB if no event)
+    if event is None:
+        return "-".join(v for _, v in federation.versions())
+    return federation.version(event)
 
-    fig.update_xaxes(showgrid=False, 
-                     zeroline=False, 
-                     range=[0,600], 
-                     fixedrange=True,
-                     visible=show_title)
-    fig.update_yaxes(showgrid=False, 
-                     zeroline=False, 
-                     range=[0,300], 
-                     fixedrange=True,
-                     visible=show_title)
-    fig.update_layout(
-                showlegend=False,
-                autosize=False,
-                width=fig_width,
-                height=fig_height,
-                margin=dict(l=margins, r=margins, t=margins, b=margins),
-            )
+def read_sql(query, event=None):
+    # app context makes this usable from background jobs and layout functions
+    return federation.read_sql(query, event)
 
-    main_line_col = "#000000"
-    red_wing_color = "#6E260E"
-    blue_wing_color = "#000099"
-    fig.update_layout(
-        # Line Horizontal
-        paper_bgcolor=bg_color,
-        plot_bgcolor=bg_color,
-        yaxis=dict(
-            scaleanchor="x",
-            scaleratio=1,
-            showgrid=False,
-            zeroline=False,
-            showline=False,
-            ticks='',
-            fixedrange=True,
-            visible=show_axis,
-            showticklabels=labelticks,
-        ),
-        xaxis=dict(
-            showgrid=False,
-            zeroline=False,
-            showline=False,
-            ticks='',
-            fixedrange=True,
-            visible=show_axis,
-            showticklabels=labelticks,
-        ),
-        yaxis2=dict(
-            scaleanchor="x2",
-            showgrid=False,
-            zeroline=False,
-            showline=False,
-            ticks='',
-            fixedrange=True,
-            visible=show_axis,
-            showticklabels=labelticks,
-        ),
-        xaxis2=dict(
-            showgrid=False,
-            zeroline=False,
-            showline=False,
-            ticks='',
-            fixedrange=True,
-            visible=show_axis,
-            showticklabels=labelticks,
-        ),
-        shapes=[
-            # Field border
-            dict(
-                type="rect", x0=15, y0=300, x1=590, y1=0,
-                line=dict(color=main_line_col, width=lwidth),
-                # fillcolor='#333333',
-                layer=glayer
-            ), 
-            # Center line
-            dict(
-                type="line", x0=305, y0=0, x1=305, y1=300,
-                line=dict(color="#666666", width=lwidth),
-                layer=glayer
-            ),
+def read_sql_all(query, events):
+    # runs the query on every selected event DB in parallel, adds an Event column
+    return federation.read_sql_all(query, events)
 
-            # Red wing line
-            dict(
-                type="line", x0=387, y0=0, x1=387, y1=300,
-                line=dict(color=red_wing_color, width=lwidth),
-                layer=glayer
-            ),
-            #Blue wing line
-            dict(
-                type="line", x0=221, y0=0, x1=221, y1=300,
-                line=dict(color=blue_wing_color, width=lwidth),
-                layer=glayer
-            ),
-            #Blue Stage Triangle
-            dict(
-                type="path",
-                path=" M 218 200 L 209 203 L 127 155 L 127 145 L 209 97 L 218 100 Z",
-                line_color=blue_wing_color,
-                layer=glayer
-            ),
-            #Red Stage Triangle
-            dict(
-                type="path",
-                path=" M 390 200 L 397 203 L 480 155 L 480 145 L 397 97 L 390 100 Z",
-                line_color=red_wing_color,
-                layer=glayer
-            ),
-            #Blue speaker
-            dict(
-                type="path",
-                path=" M 15 160 L 47 180 L 47 220 L 15 240 Z",
-                fillcolor=blue_wing_color,
-                line_color="#000000",
-                layer=glayer
-            ),
-            #Red speaker
-            dict(
-                type="path",
-                path=" M 590 160 L 558 180 L 558 220 L 590 240 Z",
-                fillcolor=red_wing_color,
-                line_color="#000000",
-                layer=glayer
-            ),
-            #Blue source line
-            dict(
-                type="path",
-                path=" M 590 60 L 525 20 L 525 0",
-                line_color=blue_wing_color,
-                layer=glayer
-            ),
-            #Red source line
-            dict(
-                type="path",
-                path=" M 15 60 L 80 20 L 80 0",
-                line_color=red_wing_color,
-                layer=glayer
-            ),
-            #Blue amp line
-            dict(
-                type="path",
-                path=" M 15 282 L 127 282 L 127 300",
-                line_color=blue_wing_color,
-                layer=glayer
-            ),
-            #Red amp line
-            dict(
-                type="path",
-                path=" M 590 282 L 478 282 L 478 300",
-                line_color=red_wing_color,
-                layer=glayer
-            ),
-        ]
-    )
-    return True
+def events_version(events):
+    # cache key for results merged over several event DBs
+    return federation.versions(federation.selected(events))
+
+# teams/matches/stages per event DB, loaded once and updated when the DB file changes
+catalogs = {event: MatchCatalog(functools.partial(read_sql, event=event), functools.partial(db_version, event))
+            for event in federation.events}
+
+# event-type n-gram index per event DB, updated the same way as the catalogs
+sequence_indexes = {event: EventSequenceIndex(functools.partial(read_sql, event=event), functools.partial(db_version, event))
+                    for event in federation.events}
+
+def match_value(event, match):
+    return f"{event}:{match}"
+
+def split_match_value(value):
+    # "event:match" -> (event, match); bare match numbers use the default event
+    event, _, match = str(value).rpartition(":")
+    return event or federation.default_event, int(match) if match.lstrip("-").isdigit() else match
+
+def team_options(events):
+    teams = sorted({team for event in federation.selected(events) for team in catalogs[event].get().teams})
+    return [{"label": team, "value": team} for team in teams]
+
+@shared_cache.cached("match_options")
+def cached_match_options(team, stage, data_version):
+    # Same options for every client looking at the same DB versions
+    return match_options(team, stage, [event for event, _ in data_version])
+
+def match_options(team, stage, events):
+    events = federation.selected(events)
+    options = []
+    for event in events:
+        for option in catalogs[event].get().match_options(team, stage):
+            label = option["label"] if len(events)==1 else f"{event} {option['label']}"
+            options.append(dict(option, label=label, value=match_value(event, option["value"])))
+    return options
 
 def distance(pos0, pos1) -> np.double:
     return np.sqrt(np.power(pos0[0]-pos1[0],2) + np.power(pos0[1]-pos1[1],2))
 
 
+# Figure and playback arrays come from one callback so the clientside
+# selection overlay is always drawn on the figure the arrays belong to
 @app.callback(
     Output(component_id='display-graph', component_property='figure'),
-    Input(component_id='game-event-table', component_property='derived_virtual_data'),
-    Input(component_id='game-event-table', component_property='derived_virtual_selected_rows'),
+    Output(component_id='playback-data', component_property='data'),
+    Output(component_id='playback-slider', component_property='min'),
+    Output(component_id='playback-slider', component_property='max'),
+    Output(component_id='playback-slider', component_property='value'),
+    Input(component_id='curr_match_df', component_property='data'),
+    Input(component_id='game-event-table', component_property='derived_virtual_indices'),
 )
-def update_field(all_rows_data, slcted_row_idx):
+def update_field(view_key, row_indices):
     def update_field_figure(display_fig, df):
-            display_fig.data = [] 
-            display_fig.layout.annotations=[]
             nrows=df.shape[0]
                        
             list_of_arrows = []
@@ -253,9 +191,11 @@ def update_field(all_rows_data, slcted_row_idx):
                     if type=="move":
                         continue
 
+                    # customdata: row position in the table, used for click-to-select
                     display_fig.add_trace(go.Scatter(
                         x=df.loc[df['name'] == type]["x"].to_list(),
                         y=df.loc[df['name'] == type]["y"].to_list(),
+                        customdata=np.flatnonzero(df['name'] == type).tolist(),
                         xaxis='x',
                         yaxis='y',
                         mode='markers',
@@ -272,114 +212,638 @@ def update_field(all_rows_data, slcted_row_idx):
 
             return display_fig
     
-    print(f"all_rows_data: {all_rows_data}")
-    if all_rows_data is not None and len(all_rows_data)>0:
-        df = pd.DataFrame(all_rows_data)
-        df["x"] = df["npos.x"]*600
-        df["y"] = (1-df["npos.y"])*300
+    # Rows come from the server-side view; the table only sends back the
+    # order/filter of its rows
+    batch = view_batch(view_key, row_indices)
+    if len(batch)>0:
+        df = batch.to_dataframe()
+        df["x"], df["y"] = active_field().to_pixels(df["npos.x"], df["npos.y"])
     else:
         df=pd.DataFrame()
         df["x"]=[]
         df["y"]=[]
 
-    new_display_fig = update_field_figure(display_fig=display_fig, df = df)
-    return new_display_fig
+    # a new figure per call: callbacks run concurrently on the server threads
+    new_display_fig = update_field_figure(display_fig=make_display_fig(), df = df)
+    return (new_display_fig, *playback_data(batch))
+
+
+def playback_data(batch):
+    # Send the match to the browser once as flat arrays in table order (so
+    # index i lines up with arrow i on the field); playback/clientside slices them
+    if len(batch)==0:
+        return {"t":[], "x":[], "y":[], "name":[], "color":[], "order":[], "tmin":0, "tmax":0}, 0, 0, 0
+
+    df = batch.to_dataframe()
+    x, y = active_field().to_pixels(df["npos.x"], df["npos.y"])
+    t = pd.to_numeric(df["time"], errors='coerce').ffill().fillna(0).to_numpy(dtype=np.double)
+    tmin = float(t.min())
+    tmax = float(t.max())
+    data = {
+        "t": t.round(3).tolist(),
+        "x": x.round(1).tolist(),
+        "y": y.round(1).tolist(),
+        "name": df["name"].tolist(),
+        "color": [event_colors.get(x, "white") for x in df["name"]],
+        "order": np.argsort(t, kind='stable').tolist(),
+        "tmin": tmin,
+        "tmax": tmax,
+    }
+    return data, tmin, tmax, tmax
+
+app.clientside_callback(
+    ClientsideFunction(namespace='playback', function_name='toggle'),
+    Output(component_id='playback-interval', component_property='disabled'),
+    Output(component_id='playback-play', component_property='children'),
+    Output(component_id='playback-slider', component_property='value', allow_duplicate=True),
+    Input(component_id='playback-play', component_property='n_clicks'),
+    State(component_id='playback-interval', component_property='disabled'),
+    State(component_id='playback-slider', component_property='value'),
+    State(component_id='playback-data', component_property='data'),
+    prevent_initial_call=True,
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='playback', function_name='tick'),
+    Output(component_id='playback-slider', component_property='value', allow_duplicate=True),
+    Output(component_id='playback-interval', component_property='disabled', allow_duplicate=True),
+    Output(component_id='playback-play', component_property='children', allow_duplicate=True),
+    Input(component_id='playback-interval', component_property='n_intervals'),
+    State(component_id='playback-slider', component_property='value'),
+    State(component_id='playback-data', component_property='data'),
+    State(component_id='playback-interval', component_property='interval'),
+    prevent_initial_call=True,
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='selection', function_name='highlight'),
+    Output(component_id='display-graph', component_property='figure', allow_duplicate=True),
+    Input(component_id='game-event-table', component_property='derived_virtual_selected_rows'),
+    Input(component_id='playback-data', component_property='data'),
+    State(component_id='display-graph', component_property='figure'),
+    prevent_initial_call=True,
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='selection', function_name='select'),
+    Output(component_id='game-event-table', component_property='selected_rows', allow_duplicate=True),
+    Input(component_id='display-graph', component_property='clickData'),
+    State(component_id='game-event-table', component_property='selected_rows'),
+    State(component_id='game-event-table', component_property='derived_virtual_indices'),
+    prevent_initial_call=True,
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='playback', function_name='render'),
+    Output(component_id='display-graph', component_property='figure', allow_duplicate=True),
+    Input(component_id='playback-slider', component_property='value'),
+    Input(component_id='playback-data', component_property='data'),
+    State(component_id='display-graph', component_property='figure'),
+    prevent_initial_call=True,
+)
+
+
+def match_view_key(team, match, stage, event_types, scout_mode):
+    # Identifies one parsed (and filtered) match view; any worker can rebuild
+    # it from the key, and the DB version keeps it from going stale
+    event, match = split_match_value(match)
+    return json.dumps([team, event, match, stage, sorted(event_types or []), scout_mode, db_version(event)])
+
+@functools.lru_cache(maxsize=256)
+def load_match_view(view_key):
+    # -> (filtered EventBatch, zone per event, original event ids)
+    team, event, match, stage, event_types, scout_mode, _ = json.loads(view_key)
+    table = stage_table(stage)
+
+    query = f"SELECT {table} FROM match WHERE Team={team} and Match={match} and {table} IS NOT NULL"
+    if scout_mode!="consensus":
+        #Only the first scouted row is used, don't fetch/parse the rest
+        query += " LIMIT 1"
+
+    df=read_sql(query, event)
+    df = df.reset_index(drop=True)
+
+    batches = [parse_events(x) for x in df[table]]
+    if len(batches)==0:
+        return EventBatch.empty(), np.zeros(0, dtype=object), np.zeros(0, dtype=int)
+
+    #Merge duplicate scouting rows into one consensus path
+    if len(batches)>1:
+        batch = EventBatch.from_dataframe(reconcile_event_lists([b.to_dataframe() for b in batches]))
+    else:
+        batch = batches[0]
+    zone = classify_zones(*active_field().to_pixels(batch.array["x"], batch.array["y"]))
+
+    #Apply event list filter
+    ids = np.flatnonzero(np.isin(batch.names, event_types))
+    return EventBatch(batch.array[ids]), zone[ids], ids
+
+@shared_cache.cached("match_table")
+def match_table(view_key):
+    # Table rows of a view; view_key already carries the DB version
+    batch, zone, ids = load_match_view(view_key)
+    return batch.to_records(ids=ids, zone=zone)
+
+def view_batch(view_key, row_indices=None):
+    # Events of a view in the table's current sort/filter order
+    if not view_key:
+        return EventBatch.empty()
+    batch, _, _ = load_match_view(view_key)
+    if row_indices is None:
+        return batch
+    # indices can briefly belong to the previous view while the table updates
+    row_indices = np.asarray(row_indices, dtype=int)
+    return EventBatch(batch.array[row_indices[row_indices < len(batch)]])
 
 
 @app.callback(
     Output(component_id='game-event-table', component_property='data'),
+    Output(component_id='curr_match_df', component_property='data'),
+    Output(component_id='game-event-table', component_property='selected_rows'),
     Input(component_id='team-select', component_property='value'),
     Input(component_id='match-select', component_property='value'),
     Input(component_id='game-stage', component_property='value'),
-    Input(component_id='event-type-filter', component_property='value')
+    Input(component_id='event-type-filter', component_property='value'),
+    Input(component_id='scout-mode', component_property='value')
 )
-def get_match_data(team, match, stage, event_types):
+def get_match_data(team, match, stage, event_types, scout_mode):
     
     if match is not None:
+        view_key = match_view_key(team, match, stage, event_types, scout_mode)
 
-        if stage=="Auto":
-            table="AutoEventList"
-        else:
-            table="TeleEventList"
-
-        df=pd.read_sql_query(f"SELECT {table} FROM match WHERE Team={team} and Match={match}", con=db.engine)
-        df = df.reset_index(drop=True)
-        
-        result = [json.loads(x) for x in df[table] if x is not None]
-        if len(result)>0:
-            #Parse EventList json map into a list
-            flat = pd.json_normalize(result[0]).to_dict(orient='records')
-            flat = [{"id":i, **x} for i, x in enumerate(flat)]
-            
-            #Apply event list filter
-            filtered =[i for i in flat if i["name"] in event_types]
-            
-            
-            return  filtered
+        #Parse EventList into table rows, the events stay server-side under view_key
+        return match_table(view_key), view_key, []
     
-    return []
+    return [], None, []
+
+
+@app.callback(
+    Output(component_id='heatmap-figure', component_property='figure'),
+    Input(component_id='team-select', component_property='value'),
+    Input(component_id='game-stage', component_property='value'),
+    Input(component_id='event-select', component_property='value'),
+    background=True,
+    running=[
+        (Output(component_id='heatmap-progress', component_property='style'),
+         {'visibility': 'visible', 'width': '100%'}, {'visibility': 'hidden', 'width': '100%'}),
+        (Output(component_id='heatmap-cancel', component_property='disabled'), False, True),
+    ],
+    progress=[
+        Output(component_id='heatmap-progress', component_property='value'),
+        Output(component_id='heatmap-progress', component_property='max'),
+    ],
+    # A new team/stage selection terminates the job still running for the
+    # old one, so stale heatmaps are dropped rather than queued
+    cancel=[Input(component_id='heatmap-cancel', component_property='n_clicks')],
+)
+def update_team_heatmap(set_progress, team, stage, events):
+    heatmap_fig = go.Figure()
+    draw_plotly_field(heatmap_fig, fig_width=300, fig_height=150, show_title=False, labelticks=False,
+                      show_axis=False, glayer='above', bg_color='black', margins=0)
+    if team is None:
+        return heatmap_fig
+
+    table = stage_table(stage)
+    df = read_sql_all(f"SELECT {table} FROM match WHERE Team={team} and {table} IS NOT NULL", events)
+    nrows = df.shape[0]
+
+    xs = []
+    ys = []
+    for i, event_json in enumerate(df[table]):
+        batch = parse_events(event_json)
+        if len(batch)>0:
+            x, y = active_field().to_pixels(batch.array["x"], batch.array["y"])
+            xs.append(x)
+            ys.append(y)
+        set_progress((str(i+1), str(nrows)))
+
+    if len(xs)>0:
+        heatmap_fig.add_trace(go.Histogram2d(
+            x=np.concatenate(xs),
+            y=np.concatenate(ys),
+            xbins=dict(start=0, end=active_field().width, size=20),
+            ybins=dict(start=0, end=active_field().height, size=20),
+            colorscale='Hot',
+            showscale=False,
+            hoverinfo='none',
+        ))
+
+    return heatmap_fig
 
 
 @app.callback(
     Output(component_id='match-select', component_property='options'),
     Output(component_id='match-select', component_property='value'),
     Input(component_id='team-select', component_property='value'),
+    Input(component_id='game-stage', component_property='value'),
+    Input(component_id='event-select', component_property='value'),
+    State(component_id='match-select', component_property='value'),
 )
-def update_matches(team):
-    df = pd.read_sql_query(f"SELECT DISTINCT Match FROM match WHERE Team={team}", con=db.engine)
-    df = df.rename(columns={'Match': 'label'})
-    df["value"] = df["label"]
-    df = df[['label', 'value']].sort_values('label').reset_index(drop=True)
-    options = df.to_dict('records')
-    if df.shape[0]>0:
-        value=df.iloc[0]["value"];
+def update_matches(team, stage, events, curr_match):
+    options = cached_match_options(team, stage, events_version(events))
+    enabled = [x["value"] for x in options if not x["disabled"]]
+    if curr_match in enabled:
+        value=curr_match
+    elif len(enabled)>0:
+        value=enabled[0]
     else:
         value=None
     return options, value
 
 @app.callback(
-    Output(component_id='team-select', component_property='options'),
-    Input(component_id='team-options', component_property='data'),
+    Output(component_id='game-stage', component_property='options'),
+    Input(component_id='team-select', component_property='value'),
+    Input(component_id='match-select', component_property='value'),
 )
-def update_teams(team_options):
-     print(team_options)
-     return team_options
+def update_stages(team, match):
+    if match is None:
+        return ["Auto", "Teleop"]
+    event, match = split_match_value(match)
+    return catalogs[event].get().stage_options(team, match)
+
+def update_team_options(events):
+    return team_options(events)
+
+def update_all_team_options(events):
+    return [{"label": "All teams", "value": "all"}] + team_options(events)
+
+# Team lists follow the event selection on every page
+for team_select_id, options_func in [('team-select', update_team_options),
+                                     ('routines-team-select', update_team_options),
+                                     ('shots-team-select', update_all_team_options),
+                                     ('cycles-team-select', update_all_team_options)]:
+    app.callback(
+        Output(component_id=team_select_id, component_property='options'),
+        Input(component_id='event-select', component_property='value'),
+        prevent_initial_call=True,
+    )(options_func)
+
+######################
+## Auto Routines
+######################
+routine_colors = ["#00FF00", "orange", "cyan", "magenta"]
+
+def stage_table(stage):
+    if stage=="Auto":
+        return "AutoEventList"
+    return "TeleEventList"
+
+def load_team_paths(team, stage="Auto", events=None):
+    # One resampled path per scouted match of the team (first scout row),
+    # across all selected events
+    table = stage_table(stage)
+    df = read_sql_all(f"SELECT Match, {table} FROM match WHERE Team={team} and {table} IS NOT NULL", events)
+    df = df.drop_duplicates(["Event", "Match"]).sort_values(["Event", "Match"])
+    multi_event = df["Event"].nunique()>1
+
+    matches = []
+    paths = []
+    event_jsons = []
+    for event, match, event_json in zip(df["Event"], df["Match"], df[table]):
+        path = AnalysisObject(parse_event_list(event_json)).resample()
+        if path is not None:
+            matches.append(f"{event} {match}" if multi_event else match)
+            paths.append(path)
+            event_jsons.append(event_json)
+    # Same paths on a common time base (cached float32 per match)
+    return matches, np.array(paths), timed_paths(event_jsons, stage)
+
+@shared_cache.cached("routines")
+def team_routines(team, data_version):
+    # Distance matrix + clusters per team, recomputed only when the DBs change
+    events = [event for event, _ in data_version]
+    matches, paths, timed = load_team_paths(team, "Auto", events)
+    labels, medoids, dist = cluster_paths(paths)
+    return matches, paths, timed, labels, medoids
 
 @app.callback(
-    Output(component_id='team-options', component_property='data'),
-    Input(component_id='team-options', component_property='data'),
+    Output(component_id='routines-graph', component_property='figure'),
+    Output(component_id='routines-summary', component_property='children'),
+    Input(component_id='routines-team-select', component_property='value'),
+    Input(component_id='event-select', component_property='value'),
+    # clustering a team's paths: off the Flask threads, like the heatmap
+    background=True,
 )
-def get_teams(data):
-    teams_df = pd.read_sql_query("SELECT DISTINCT Team FROM match", con=db.engine)
-    teams_df = teams_df.rename(columns={'Team': 'label'})
-    teams_df["value"] = teams_df["label"]
-    teams_df = teams_df[['label', 'value']].sort_values('label').reset_index(drop=True)
-    teams_options = teams_df.to_dict('records')
+def update_routines(team, events):
+    routines_fig = go.Figure()
+    draw_plotly_field(routines_fig, show_title=False, labelticks=False, show_axis=False,
+                      glayer='below', bg_color='black', margins=0)
+    if team is None:
+        return routines_fig, None
+
+    matches, paths, timed, labels, medoids = team_routines(team, events_version(events))
+    grid = time_grid("Auto")
+    # markers on the average path every second
+    every_second = slice(None, None, int(round(1/(grid[1]-grid[0]))))
+
+    rows = []
+    for c, medoid in enumerate(medoids):
+        members = np.flatnonzero(labels == c)
+        color = routine_colors[c % len(routine_colors)]
+        for i in members:
+            routines_fig.add_trace(go.Scatter(
+                x=paths[i][:, 0], y=paths[i][:, 1],
+                mode='lines',
+                line=dict(color=color, width=1),
+                opacity=0.25,
+                hoverinfo='none',
+                showlegend=False,
+            ))
+        routines_fig.add_trace(go.Scatter(
+            x=paths[medoid][:, 0], y=paths[medoid][:, 1],
+            mode='lines+markers',
+            line=dict(color=color, width=4),
+            marker=dict(size=6),
+            name=f"Routine {c+1} ({members.shape[0]}/{len(matches)})",
+            hoverinfo='name',
+        ))
+        # Where the robot is on average at each point in time
+        mean_path = np.nanmean(timed[members], axis=0)[every_second]
+        routines_fig.add_trace(go.Scatter(
+            x=mean_path[:, 0], y=mean_path[:, 1],
+            mode='lines+markers',
+            line=dict(color=color, width=2, dash='dot'),
+            marker=dict(size=4),
+            customdata=grid[every_second],
+            hovertemplate="%{customdata:.0f} s<extra></extra>",
+            name=f"Routine {c+1} average over time",
+        ))
+        rows.append({"Routine": c+1,
+                     "Matches": ", ".join(str(matches[i]) for i in members),
+                     "Frequency": f"{members.shape[0]}/{len(matches)}"})
+
+    routines_fig.update_layout(showlegend=True, legend=dict(font=dict(color="white")))
+    summary = dbc.Table.from_dataframe(pd.DataFrame(rows), striped=True, bordered=False, size='sm') if len(rows)>0 else None
+    return routines_fig, summary
 
-    return teams_options
 
 ######################
-## Create Components
+## Zone Occupancy
 ######################
+@shared_cache.cached("zones")
+def match_zone_summary(team, event, match, stage, data_version):
+    # Per-match time-in-zone table, computed once and shared by all workers
+    table = stage_table(stage)
+    df = read_sql(f"SELECT {table} FROM match WHERE Team={team} and Match={match} and {table} IS NOT NULL LIMIT 1", event)
+    if df.shape[0]==0:
+        return []
+    summary = zone_summary(parse_event_list(df[table].iloc[0]))
+    summary["seconds"] = summary["seconds"].round(2)
+    summary["fraction"] = (summary["fraction"]*100).round(1)
+    return summary.to_dict('records')
 
-# create plotly figure, draw court, and create container for the court figure
-display_fig = go.Figure()
+@app.callback(
+    Output(component_id='zone-table', component_property='data'),
+    Input(component_id='team-select', component_property='value'),
+    Input(component_id='match-select', component_property='value'),
+    Input(component_id='game-stage', component_property='value'),
+)
+def update_zone_table(team, match, stage):
+    if team is None or match is None:
+        return []
+    event, match = split_match_value(match)
+    return match_zone_summary(team, event, match, stage, db_version(event))
 
-draw_plotly_field(display_fig, show_title=False, labelticks=False, show_axis=False,
-                  glayer='below', bg_color='black', margins=0)
 
+######################
+## Shot Chart
+######################
+@shared_cache.cached("shot_bins")
+def team_shot_bins(team, stage, data_version):
+    # Hexbin of every speaker shot for a team ("all" for every team) over the
+    # selected events
+    if stage=="All":
+        tables = ["AutoEventList", "TeleEventList"]
+    else:
+        tables = [stage_table(stage)]
+    where = "" if team=="all" else f"WHERE Team={team}"
+    events = [event for event, _ in data_version]
+    df = read_sql_all(f"SELECT Team, Match, {', '.join(tables)} FROM match {where}", events)
+    df = df.drop_duplicates(["Event", "Team", "Match"])
+
+    event_lists = [parse_event_list(x) for table in tables for x in df[table] if x is not None]
+    x, y, made = shot_events(event_lists)
+    return hexbin(x, y, made)
+
+@app.callback(
+    Output(component_id='shots-graph', component_property='figure'),
+    Input(component_id='shots-team-select', component_property='value'),
+    Input(component_id='shots-stage', component_property='value'),
+    Input(component_id='event-select', component_property='value'),
+    # "all" parses every team's events after each DB write
+    background=True,
+)
+def update_shot_chart(team, stage, events):
+    shots_fig = go.Figure()
+    draw_plotly_field(shots_fig, show_title=False, labelticks=False, show_axis=False,
+                      glayer='below', bg_color='black', margins=0)
+    if team is None:
+        return shots_fig
+
+    bins = team_shot_bins(team, stage, events_version(events))
+    if bins.shape[0]>0:
+        # Hexagon area grows with attempts, color shows accuracy
+        scale = np.sqrt(bins["attempts"]/bins["attempts"].max())
+        shots_fig.add_trace(go.Scatter(
+            x=bins["x"], y=bins["y"],
+            mode='markers',
+            marker=dict(
+                symbol='hexagon',
+                size=(HEX_SIZE*(0.4+0.6*scale)).round(1),
+                color=bins["accuracy"],
+                colorscale='RdYlGn',
+                cmin=0, cmax=1,
+                showscale=True,
+                colorbar=dict(title="Accuracy", tickformat=".0%"),
+                line=dict(width=0),
+            ),
+            customdata=np.column_stack([bins["makes"], bins["attempts"]]),
+            hovertemplate="%{customdata[0]}/%{customdata[1]} made<extra></extra>",
+        ))
+    return shots_fig
+
+
+######################
+## Cycle Times
+######################
+@shared_cache.cached("cycles")
+def all_cycles(stage, data_version):
+    # Every cycle of every team (first scout row per match) in the selected DBs
+    if stage=="All":
+        tables = ["AutoEventList", "TeleEventList"]
+    else:
+        tables = [stage_table(stage)]
+    events = [event for event, _ in data_version]
+    df = read_sql_all(f"SELECT Team, Match, {', '.join(tables)} FROM match", events)
+    df = df.drop_duplicates(["Event", "Team", "Match"])
+
+    frames = []
+    for table in tables:
+        for event, team, match, event_json in zip(df["Event"], df["Team"], df["Match"], df[table]):
+            if event_json is None:
+                continue
+            cycles = extract_cycles(parse_events(event_json))
+            if cycles.shape[0]>0:
+                frames.append(cycles.assign(Event=event, Team=team, Match=match))
+    if len(frames)==0:
+        return pd.DataFrame(columns=["Event", "Team", "Match", "start", "end", "duration", "distance",
+                                     "start_event", "outcome", "scored"])
+    return pd.concat(frames, ignore_index=True)
+
+@shared_cache.cached("cycle_stats")
+def team_cycle_stats(stage, data_version):
+    # Per-team cycle time distribution, fastest median first (pick list order)
+    stats = cycle_stats(all_cycles(stage, data_version), by="Team")
+    return stats.sort_values("median").round(2)
+
+@app.callback(
+    Output(component_id='cycles-graph', component_property='figure'),
+    Output(component_id='cycles-table', component_property='data'),
+    Input(component_id='cycles-team-select', component_property='value'),
+    Input(component_id='cycles-stage', component_property='value'),
+    Input(component_id='event-select', component_property='value'),
+    # all_cycles parses every team's events after each DB write
+    background=True,
+)
+def update_cycles(team, stage, events):
+    cycles_fig = go.Figure()
+    cycles_fig.update_layout(xaxis_title="Cycle time (s)", yaxis_title="Cycles", barmode='stack',
+                             margin=dict(l=40, r=20, t=20, b=40))
+    data_version = events_version(events)
+    stats = team_cycle_stats(stage, data_version)
+    if team is None:
+        return cycles_fig, stats.to_dict('records')
+
+    cycles = all_cycles(stage, data_version)
+    if team!="all":
+        cycles = cycles[cycles["Team"]==team]
+    for outcome, group in cycles.groupby("outcome"):
+        cycles_fig.add_trace(go.Histogram(
+            x=group["duration"],
+            name=outcome,
+            marker_color=event_colors.get(outcome, "white"),
+            xbins=dict(size=1),
+        ))
+    return cycles_fig, stats.to_dict('records')
+
+
+######################
+## Pattern Search
+######################
+@app.callback(
+    Output(component_id='pattern-table', component_property='data'),
+    Output(component_id='pattern-status', component_property='children'),
+    Input(component_id='pattern-search', component_property='value'),
+    Input(component_id='event-select', component_property='value'),
+)
+def update_pattern_search(text, events):
+    if not text:
+        return [], ""
+    try:
+        pattern, within, stage = parse_pattern(text)
+    except ValueError as e:
+        return [], str(e)
+
+    frames = []
+    for event in federation.selected(events):
+        hits = sequence_indexes[event].get().query(pattern, within, stage)
+        frames.append(hits.assign(Event=event))
+    hits = pd.concat(frames, ignore_index=True)
+    if hits.shape[0]==0:
+        return [], "No matches"
+
+    # One row per team: how often and in how many matches the pattern shows up
+    hits["match_key"] = hits["Event"] + ":" + hits["Match"].astype(str)
+    hits["duration"] = hits["end"] - hits["start"]
+    teams = hits.groupby("Team").agg(matches=("match_key", "nunique"), occurrences=("start", "size"),
+                                     duration=("duration", "mean")).reset_index().round(2)
+    teams = teams.sort_values(["matches", "occurrences"], ascending=False)
+    return teams.to_dict('records'), f"{hits.shape[0]} occurrences, {teams.shape[0]} teams"
+
+
+######################
+## Path Similarity Search
+######################
+@shared_cache.cached("path_index")
+def path_index(stage, data_version):
+    # Embedding of every scouted path in the selected DBs, rebuilt when a DB changes
+    table = stage_table(stage)
+    events = [event for event, _ in data_version]
+    df = read_sql_all(f"SELECT Team, Match, {table} FROM match WHERE {table} IS NOT NULL", events)
+    df = df.drop_duplicates(["Event", "Team", "Match"])
+
+    keys = []
+    paths = []
+    for event, team, match, event_json in zip(df["Event"], df["Team"], df["Match"], df[table]):
+        path = AnalysisObject(parse_event_list(event_json)).resample()
+        if path is not None:
+            keys.append((event, team, match))
+            paths.append(path)
+    return PathIndex(keys, np.array(paths))
+
+@app.callback(
+    Output(component_id='similar-table', component_property='data'),
+    Input(component_id='similar-search', component_property='n_clicks'),
+    State(component_id='curr_match_df', component_property='data'),
+    State(component_id='game-event-table', component_property='derived_virtual_indices'),
+    State(component_id='team-select', component_property='value'),
+    State(component_id='match-select', component_property='value'),
+    State(component_id='game-stage', component_property='value'),
+    State(component_id='event-select', component_property='value'),
+    prevent_initial_call=True,
+    # path_index embeds every scouted path after each DB write
+    background=True,
+)
+def find_similar_paths(n_clicks, view_key, row_indices, team, match, stage, events):
+    batch = view_batch(view_key, row_indices)
+    if len(batch)==0 or match is None:
+        return []
+
+    # Search with the path as currently displayed (after table filters)
+    event, match = split_match_value(match)
+    path = AnalysisObject(batch.to_dataframe()).resample()
+    results = path_index(stage, events_version(events)).query(path, k=20, exclude=(event, team, match))
+    return [{"event": e, "team": t, "match": m, "distance": round(d, 1)} for (e, t, m), d in results]
+
+
+######################
+## Create Components
+######################
+
+# create plotly figure, draw court, and create container for the court figure
+def make_display_fig():
+    display_fig = go.Figure()
+    draw_plotly_field(display_fig, show_title=False, labelticks=False, show_axis=False,
+                      glayer='below', bg_color='black', margins=0)
+    return display_fig
 
 
 display_graph = dcc.Graph(
     id='display-graph',
-    figure=display_fig,
+    figure=make_display_fig(),
     config={'staticPlot': False,
             'scrollZoom': False,
             },
 )
 
+playback_controls = dbc.Row([
+    dbc.Col(
+        dbc.Button("Play", id='playback-play', color="secondary", size="sm", n_clicks=0),
+        width="auto",
+    ),
+    dbc.Col(
+        dcc.Slider(id='playback-slider', min=0, max=0, step=0.1, value=0, marks=None,
+                   updatemode='drag', tooltip={'placement': 'bottom'},
+                   className='dashboard-range-slider'),
+    ),
+    dcc.Interval(id='playback-interval', interval=100, n_intervals=0, disabled=True),
+    dcc.Store(id='playback-data', storage_type='memory', data=None),
+],
+    align="center",
+    className='mt-2',
+)
+
 heatmap_fig = go.Figure()
-fig = px.density_heatmap([])
 
 heatmap_graph = dcc.Graph(
     id='heatmap-figure', 
@@ -389,15 +853,23 @@ heatmap_graph = dcc.Graph(
             },
 )
 
-team_dropdown = dcc.Dropdown(
-    id='team-select', multi=False, placeholder='Select Team...',
-    options=[],
-    searchable=True,
-    clearable=False,
-    value=1629636,
-    persistence=False,
-    className='mb-3'
-)
+def make_team_dropdown(events, id='team-select'):
+    # team list comes straight from the catalogs, no callback round trip
+    options = team_options(events)
+    teams = [x["value"] for x in options]
+    value = 1629636
+    if value not in teams and len(teams)>0:
+        value = teams[0]
+
+    return dcc.Dropdown(
+        id=id, multi=False, placeholder='Select Team...',
+        options=options,
+        searchable=True,
+        clearable=False,
+        value=value,
+        persistence=False,
+        className='mb-3'
+    )
 
 stage_dropdown = dcc.Dropdown(
     id='game-stage', multi=False, placeholder='Select Stage...',
@@ -409,6 +881,17 @@ stage_dropdown = dcc.Dropdown(
     className='mb-3'
 )
 
+scout_mode_dropdown = dcc.Dropdown(
+    id='scout-mode', multi=False, placeholder='Select Scout Mode...',
+    options=[{"label":"First scout", "value":"first"},
+             {"label":"Consensus", "value":"consensus"}],
+    searchable=False,
+    clearable=False,
+    value="first",
+    persistence=False,
+    className='mb-3'
+)
+
 event_type_filter_dropdown = html.Div([
     dbc.DropdownMenu([
         dcc.Checklist(
@@ -450,93 +933,385 @@ match_dropdown = dcc.Dropdown(
 ## Dashboard
 ######################
 
-dashboard_page = dbc.Container([
-    dcc.Store(id='team-options', storage_type='memory', data=[]),
-    dcc.Store(id='event-filters', storage_type='memory', data=[]),
-    dcc.Store(id="curr_match_df", storage_type='memory', data=[]),
-    dbc.Row([
-        #########################################
-        #### FIRST COLUMN OF DASHBOARD PAGE ####
-        dbc.Col([
-            html.H4("Team",
-                    className='mt-2 text-center',
-                    style={'font=size': '14px'}),
-            html.Hr(className="my-2"),
-            team_dropdown,
-            html.H4("Match",
-                    className='mt-2 text-center',
-                    style={'font=size': '14px'}),
-            html.Hr(className="my-2"),
-            match_dropdown,
-            stage_dropdown,
-            event_type_filter_dropdown  
-        ],
-            width=2,
-            className='ml-0 mr-0',
-        ),
-        #########################################
-
-        #########################################
-        #### SECOND COLUMN OF DASHBOARD PAGE ####
-        dbc.Col([
-             html.H4("Field",
-                    className='mt-2 text-center',
-                    style={'font=size': '14px'}),
-            html.Hr(className="my-2"),
-            display_graph,
-        ],
-            width=7,
-            className="justify-content-center"
-        ),
-        #########################################
-        ]),
-    dbc.Row([
-
-        dbc.Col([
-            html.H5("Match Events",
-                    className='mt-4 mb-4 text-center'),
-            dash_table.DataTable(
-                id='game-event-table',
-                columns=[
-                    dict( id="id", name="Event ID"),
-                    dict( id='name', name='Event' ),
-                    dict( id='npos.x', name='Normalized X Position', type='numeric' ),
-                    dict( id='npos.y', name='Normalize Y Position' , type='numeric' ),
-                    dict( id='time', name='Time' , type='numeric' ),
-                ],
-                style_cell={
-                    "fontFamily": "Ubuntu", 
-                    "fontSize": "20px", 
-                    "width": "75px",
-                    "whiteSpace": "nowrap",
-                    "textAlign": "center",
-                    "border": 'none', 
-                    "color" : 'black'
-                },
-                style_header={
-                    "height": "50px",
-                    "whiteSpace": "normal",
-                    "backgroundColor": "rgb(100,100,100)",
-                    "fontWeight": "bold",
-                    "color":"yellow"
-                },
-                style_data_conditional=[
-                    {
-                        'if': {'row_index': 'odd'},
-                        'backgroundColor': 'rgb(250,250,250)',
-                    }
-                ],
-                style_table={'border': 'none'},
-                cell_selectable=False,
-                sort_action='native',
-                filter_action='native'
+def make_dashboard_page(events):
+    return dbc.Container([
+        dcc.Store(id='event-filters', storage_type='memory', data=[]),
+        dcc.Store(id="curr_match_df", storage_type='memory', data=None),
+        dbc.Row([
+            #########################################
+            #### FIRST COLUMN OF DASHBOARD PAGE ####
+            dbc.Col([
+                html.H4("Team",
+                        className='mt-2 text-center',
+                        style={'font=size': '14px'}),
+                html.Hr(className="my-2"),
+                make_team_dropdown(events),
+                html.H4("Match",
+                        className='mt-2 text-center',
+                        style={'font=size': '14px'}),
+                html.Hr(className="my-2"),
+                match_dropdown,
+                stage_dropdown,
+                scout_mode_dropdown,
+                event_type_filter_dropdown  
+            ],
+                width=2,
+                className='ml-0 mr-0',
+            ),
+            #########################################
+
+            #########################################
+            #### SECOND COLUMN OF DASHBOARD PAGE ####
+            dbc.Col([
+                 html.H4("Field",
+                        className='mt-2 text-center',
+                        style={'font=size': '14px'}),
+                html.Hr(className="my-2"),
+                display_graph,
+                playback_controls,
+            ],
+                width=7,
+                className="justify-content-center"
+            ),
+            dbc.Col([
+                 html.H4("Team Heatmap",
+                        className='mt-2 text-center',
+                        style={'font=size': '14px'}),
+                html.Hr(className="my-2"),
+                heatmap_graph,
+                html.Progress(id='heatmap-progress', value='0', max='1',
+                              style={'visibility': 'hidden', 'width': '100%'}),
+                dbc.Button("Cancel", id='heatmap-cancel', color="secondary", size="sm",
+                           disabled=True, className='mt-1'),
+            ],
+                width=3,
+            ),
+            #########################################
+            ]),
+        dbc.Row([
+
+            dbc.Col([
+                html.H5("Match Events",
+                        className='mt-4 mb-4 text-center'),
+                dash_table.DataTable(
+                    id='game-event-table',
+                    columns=[
+                        dict( id="id", name="Event ID"),
+                        dict( id='name', name='Event' ),
+                        dict( id='npos.x', name='Normalized X Position', type='numeric' ),
+                        dict( id='npos.y', name='Normalize Y Position' , type='numeric' ),
+                        dict( id='time', name='Time' , type='numeric' ),
+                        dict( id='scouts', name='Scouts' , type='numeric' ),
+                        dict( id='zone', name='Zone' ),
+                    ],
+                    style_cell={
+                        "fontFamily": "Ubuntu", 
+                        "fontSize": "20px", 
+                        "width": "75px",
+                        "whiteSpace": "nowrap",
+                        "textAlign": "center",
+                        "border": 'none', 
+                        "color" : 'black'
+                    },
+                    style_header={
+                        "height": "50px",
+                        "whiteSpace": "normal",
+                        "backgroundColor": "rgb(100,100,100)",
+                        "fontWeight": "bold",
+                        "color":"yellow"
+                    },
+                    style_data_conditional=[
+                        {
+                            'if': {'row_index': 'odd'},
+                            'backgroundColor': 'rgb(250,250,250)',
+                        }
+                    ],
+                    style_table={'border': 'none'},
+                    cell_selectable=False,
+                    row_selectable='multi',
+                    selected_rows=[],
+                    sort_action='native',
+                    filter_action='native'
+                )
+            ], 
+            width=12,
+            style={'paddingRight': '5rem'}
             )
-        ], 
-        width=12,
-        style={'paddingRight': '5rem'}
-        )
+        ]),
+        dbc.Row([
+            dbc.Col([
+                html.H5("Similar Paths",
+                        className='mt-4 mb-2 text-center'),
+                dbc.Button("Find paths like this one", id='similar-search', color="secondary",
+                           size="sm", n_clicks=0, className='mb-2'),
+                dash_table.DataTable(
+                    id='similar-table',
+                    columns=[
+                        dict( id='event', name='Event'),
+                        dict( id='team', name='Team'),
+                        dict( id='match', name='Match'),
+                        dict( id='distance', name='Distance', type='numeric'),
+                    ],
+                    style_cell={
+                        "fontFamily": "Ubuntu",
+                        "textAlign": "center",
+                        "border": 'none',
+                        "color" : 'black'
+                    },
+                    style_header={
+                        "backgroundColor": "rgb(100,100,100)",
+                        "fontWeight": "bold",
+                        "color":"yellow"
+                    },
+                    cell_selectable=False,
+                    sort_action='native',
+                ),
+            ],
+                width=6,
+            ),
+            dbc.Col([
+                html.H5("Time In Zone",
+                        className='mt-4 mb-2 text-center'),
+                dash_table.DataTable(
+                    id='zone-table',
+                    columns=[
+                        dict( id='zone', name='Zone'),
+                        dict( id='seconds', name='Seconds', type='numeric'),
+                        dict( id='fraction', name='% Of Time', type='numeric'),
+                        dict( id='events', name='Events', type='numeric'),
+                    ],
+                    style_cell={
+                        "fontFamily": "Ubuntu",
+                        "textAlign": "center",
+                        "border": 'none',
+                        "color" : 'black'
+                    },
+                    style_header={
+                        "backgroundColor": "rgb(100,100,100)",
+                        "fontWeight": "bold",
+                        "color":"yellow"
+                    },
+                    cell_selectable=False,
+                    sort_action='native',
+                ),
+            ],
+                width=6,
+            ),
+        ]),
+    ])
+
+
+######################
+## Auto Routines Page
+######################
+
+def make_routines_page(events):
+    return dbc.Container([
+        dbc.Row([
+            dbc.Col([
+                html.H4("Team",
+                        className='mt-2 text-center',
+                        style={'font=size': '14px'}),
+                html.Hr(className="my-2"),
+                make_team_dropdown(events, id='routines-team-select'),
+            ],
+                width=2,
+                className='ml-0 mr-0',
+            ),
+            dbc.Col([
+                html.H4("Auto Routines",
+                        className='mt-2 text-center',
+                        style={'font=size': '14px'}),
+                html.Hr(className="my-2"),
+                dcc.Graph(id='routines-graph',
+                          config={'staticPlot': False,
+                                  'scrollZoom': False,
+                                  }),
+                html.Div(id='routines-summary', className='mt-3'),
+            ],
+                width=10,
+            ),
+        ])
+    ])
+
+
+######################
+## Shot Chart Page
+######################
+
+def make_shots_page(events):
+    return dbc.Container([
+        dbc.Row([
+            dbc.Col([
+                html.H4("Team",
+                        className='mt-2 text-center',
+                        style={'font=size': '14px'}),
+                html.Hr(className="my-2"),
+                dcc.Dropdown(
+                    id='shots-team-select', multi=False, placeholder='Select Team...',
+                    options=update_all_team_options(events),
+                    searchable=True,
+                    clearable=False,
+                    value="all",
+                    persistence=False,
+                    className='mb-3'
+                ),
+                dcc.Dropdown(
+                    id='shots-stage', multi=False, placeholder='Select Stage...',
+                    options=["All", "Auto", "Teleop"],
+                    searchable=False,
+                    clearable=False,
+                    value="All",
+                    persistence=False,
+                    className='mb-3'
+                ),
+            ],
+                width=2,
+                className='ml-0 mr-0',
+            ),
+            dbc.Col([
+                html.H4("Speaker Shot Chart",
+                        className='mt-2 text-center',
+                        style={'font=size': '14px'}),
+                html.Hr(className="my-2"),
+                dcc.Graph(id='shots-graph',
+                          config={'staticPlot': False,
+                                  'scrollZoom': False,
+                                  }),
+            ],
+                width=10,
+            ),
+        ])
+    ])
+
+
+######################
+## Cycle Times Page
+######################
+
+def make_cycles_page(events):
+    return dbc.Container([
+        dbc.Row([
+            dbc.Col([
+                html.H4("Team",
+                        className='mt-2 text-center',
+                        style={'font=size': '14px'}),
+                html.Hr(className="my-2"),
+                dcc.Dropdown(
+                    id='cycles-team-select', multi=False, placeholder='Select Team...',
+                    options=update_all_team_options(events),
+                    searchable=True,
+                    clearable=False,
+                    value="all",
+                    persistence=False,
+                    className='mb-3'
+                ),
+                dcc.Dropdown(
+                    id='cycles-stage', multi=False, placeholder='Select Stage...',
+                    options=["All", "Auto", "Teleop"],
+                    searchable=False,
+                    clearable=False,
+                    value="Teleop",
+                    persistence=False,
+                    className='mb-3'
+                ),
+            ],
+                width=2,
+                className='ml-0 mr-0',
+            ),
+            dbc.Col([
+                html.H4("Cycle Times",
+                        className='mt-2 text-center',
+                        style={'font=size': '14px'}),
+                html.Hr(className="my-2"),
+                dcc.Graph(id='cycles-graph',
+                          config={'staticPlot': False,
+                                  'scrollZoom': False,
+                                  }),
+            ],
+                width=10,
+            ),
+        ]),
+        dbc.Row([
+            dbc.Col([
+                html.H5("Cycle Time By Team",
+                        className='mt-4 mb-2 text-center'),
+                dash_table.DataTable(
+                    id='cycles-table',
+                    columns=[
+                        dict( id='Team', name='Team'),
+                        dict( id='cycles', name='Cycles', type='numeric'),
+                        dict( id='median', name='Median (s)', type='numeric'),
+                        dict( id='mean', name='Mean (s)', type='numeric'),
+                        dict( id='p25', name='25% (s)', type='numeric'),
+                        dict( id='p75', name='75% (s)', type='numeric'),
+                        dict( id='score_rate', name='Scored', type='numeric'),
+                        dict( id='distance', name='Travel', type='numeric'),
+                    ],
+                    style_cell={
+                        "fontFamily": "Ubuntu",
+                        "textAlign": "center",
+                        "border": 'none',
+                        "color" : 'black'
+                    },
+                    style_header={
+                        "backgroundColor": "rgb(100,100,100)",
+                        "fontWeight": "bold",
+                        "color":"yellow"
+                    },
+                    cell_selectable=False,
+                    sort_action='native',
+                    page_size=30,
+                ),
+            ]),
+        ]),
+    ])
+
+
+######################
+## Pattern Search Page
+######################
+
+def make_patterns_page(events):
+    return dbc.Container([
+        dbc.Row([
+            dbc.Col([
+                html.H4("Event Pattern Search",
+                        className='mt-2 text-center',
+                        style={'font=size': '14px'}),
+                html.Hr(className="my-2"),
+                dcc.Input(
+                    id='pattern-search', type='text', debounce=True,
+                    placeholder='e.g. pickup > move > scoreAmp in auto, or missSpeaker * pickup within 3',
+                    className='form-control mb-2',
+                ),
+                html.Div(id='pattern-status', className='mb-2 text-muted'),
+                dash_table.DataTable(
+                    id='pattern-table',
+                    columns=[
+                        dict( id='Team', name='Team'),
+                        dict( id='matches', name='Matches', type='numeric'),
+                        dict( id='occurrences', name='Occurrences', type='numeric'),
+                        dict( id='duration', name='Avg Duration (s)', type='numeric'),
+                    ],
+                    style_cell={
+                        "fontFamily": "Ubuntu",
+                        "textAlign": "center",
+                        "border": 'none',
+                        "color" : 'black'
+                    },
+                    style_header={
+                        "backgroundColor": "rgb(100,100,100)",
+                        "fontWeight": "bold",
+                        "color":"yellow"
+                    },
+                    cell_selectable=False,
+                    sort_action='native',
+                    page_size=30,
+                ),
+            ]),
+        ]),
     ])
-])
 
 
 ######################
@@ -545,6 +1320,10 @@ dashboard_page = dbc.Container([
 navigation_bar = html.Div(
     dbc.NavbarSimple([
         dbc.NavLink("Interactive Dashboard", href="/dashboard", active='exact', id='dashboard-'),
+        dbc.NavLink("Auto Routines", href="/routines", active='exact', id='routines-'),
+        dbc.NavLink("Shot Chart", href="/shots", active='exact', id='shots-'),
+        dbc.NavLink("Cycle Times", href="/cycles", active='exact', id='cycles-'),
+        dbc.NavLink("Pattern Search", href="/patterns", active='exact', id='patterns-'),
     ],
         dark=True,
         color='#0047AB',
@@ -559,17 +1338,61 @@ navigation_bar = html.Div(
 ## Main Layout
 ######################
 
-content = html.Div(id='page-content', children=[dashboard_page])
+pages = {
+    "/routines": make_routines_page,
+    "/shots": make_shots_page,
+    "/cycles": make_cycles_page,
+    "/patterns": make_patterns_page,
+}
+
+def make_page(pathname, events):
+    return pages.get(pathname, make_dashboard_page)(federation.selected(events))
+
+@app.callback(
+    Output(component_id='page-content', component_property='children'),
+    Input(component_id='url', component_property='pathname'),
+    State(component_id='event-select', component_property='value'),
+)
+def render_page(pathname, events):
+    # The dashboard page is already in the initial layout; only deep links
+    # to the other pages pay for a round trip on the first load
+    if ctx.triggered_id is None and pages.get(pathname) is None:
+        return no_update
+    return make_page(pathname, events)
+
+def make_event_select():
+    return dbc.Container(
+        dcc.Dropdown(
+            id='event-select', multi=True, placeholder='Select Events...',
+            options=[{"label": event, "value": event} for event in federation.events],
+            searchable=True,
+            clearable=False,
+            value=[federation.default_event],
+            persistence=False,
+            className='mt-2'
+        ),
+    )
+
+def serve_layout():
+    # The catalog-backed dashboard page is embedded directly. Dash requests
+    # the layout from /_dash-layout, not from the page's path, so deep links
+    # to the other pages are swapped in by the url callback
+    content = html.Div(id='page-content', children=[make_dashboard_page([federation.default_event])])
+
+    return html.Div([
+        dcc.Location(id='url', refresh=False),
+        navigation_bar,
+        make_event_select(),
+        content
+    ])
 
-app.layout = html.Div([
-    dcc.Location(id='url', refresh=False),
-    navigation_bar,
-    content
-])
+app.layout = serve_layout
 
 
 
 
+print(f"Dashboard ready in {(time.perf_counter()-startup_t0)*1000:.0f} ms "
+      f"(fast start {'on' if fast_start else 'off'})", flush=True)
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,80 @@
+import hashlib
+import os
+from storage import LRU, load_array, save_array
+
+######################
+## Settings
+######################
+CACHE_DIR = os.environ.get(
+    "PATH_DASHBOARD_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache"))
+EVENT_CACHE_DIR = os.path.join(CACHE_DIR, "events")
+
+# Bump when the on-disk layout changes so stale files are ignored
+FORMAT_VERSION = "2"
+
+# Loaded arrays kept in this process, least recently used dropped first
+# (a match is only a few KB)
+MAX_LOADED = int(os.environ.get("PATH_DASHBOARD_EVENT_LRU", 4096))
+
+_loaded = LRU(MAX_LOADED)
+
+
+######################
+## Helper Functions
+######################
+def content_key(event_json):
+    return hashlib.sha1((FORMAT_VERSION + event_json).encode("utf-8")).hexdigest()
+
+
+def _path(key):
+    return os.path.join(EVENT_CACHE_DIR, key[:2], f"{key}.npy")
+
+
+######################
+## Cache API
+######################
+def load(event_json):
+    # Returns the event array for this EventList json, or None on a miss
+    key = content_key(event_json)
+    records = _loaded.get(key)
+    if records is not None:
+        return records
+    path = _path(key)
+    if not os.path.exists(path):
+        return None
+    records = load_array(path)
+    if records is not None:
+        _loaded.put(key, records)
+    return records
+
+
+def store(event_json, array):
+    # array: fixed-dtype numpy (structured) array, see events.EVENT_DTYPE
+    if array.shape[0] == 0:
+        return
+    save_array(_path(content_key(event_json)), array)
+
+
+def preload():
+    # Load up to MAX_LOADED cached matches at worker startup, newest first
+    if not os.path.isdir(EVENT_CACHE_DIR):
+        return 0
+    files = [os.path.join(root, file) for root, _, names in os.walk(EVENT_CACHE_DIR)
+             for file in names if file.endswith(".npy")]
+    files.sort(key=lambda f: os.path.getmtime(f), reverse=True)
+    for file in reversed(files[:MAX_LOADED]):
+        records = load_array(file)
+        if records is not None:
+            _loaded.put(os.path.basename(file)[:-len(".npy")], records)
+    return len(_loaded)
+
+
+def clear():
+    _loaded.clear()
+    if not os.path.isdir(EVENT_CACHE_DIR):
+        return
+    for root, _, files in os.walk(EVENT_CACHE_DIR):
+        for file in files:
+            if file.endswith(".npy"):
+                os.remove(os.path.join(root, file))
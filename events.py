@@ -0,0 +1,178 @@
+import json
+import numpy as np
+import pandas as pd
+import event_cache
+
+######################
+## Settings
+######################
+# Two scouts' events of the same type closer than this in time are
+# treated as the same event when building a consensus path
+RECONCILE_TOLERANCE = 1.0
+
+
+######################
+## Compact Event Container
+######################
+# Event names are stored as int8 codes; anything not listed decodes as "unknown"
+EVENT_TYPES = ["init", "move", "pickup", "drop", "scoreSpeaker", "missSpeaker", "scoreAmp", "missAmp"]
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+UNKNOWN_CODE = -1
+_EVENT_NAMES = np.array(EVENT_TYPES + ["unknown"], dtype=object)
+
+# Marker colors used wherever events are drawn on the field
+EVENT_COLORS = {
+    "scoreSpeaker" : "#00FF00",
+    "missSpeaker" : "red",
+    "scoreAmp" : "blue",
+    "missAmp" : "purple",
+    "move" : "white",
+    "pickup" : "orange",
+    "drop" : "black",
+    "init" : "cyan"
+}
+
+# 14 bytes per event, packed so a cached match loads straight from disk
+EVENT_DTYPE = np.dtype([
+    ("code", np.int8),
+    ("x", np.float32),
+    ("y", np.float32),
+    ("time", np.float32),
+    ("scouts", np.int8),
+])
+
+
+class EventBatch:
+    # One match worth of events as a single structured array. Field access
+    # (array["x"]) gives strided views into it; DataFrames and records copy
+    # the fields out, so they are only built when a caller needs them.
+    __slots__ = ("array",)
+
+    def __init__(self, array):
+        self.array = array
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros(0, dtype=EVENT_DTYPE))
+
+    @classmethod
+    def from_dataframe(cls, df):
+        array = np.zeros(df.shape[0], dtype=EVENT_DTYPE)
+        if df.shape[0] == 0:
+            return cls(array)
+        array["code"] = df["name"].map(EVENT_CODES).fillna(UNKNOWN_CODE).to_numpy(dtype=np.int8)
+        array["x"] = pd.to_numeric(df["npos.x"], errors='coerce').to_numpy(dtype=np.float32)
+        array["y"] = pd.to_numeric(df["npos.y"], errors='coerce').to_numpy(dtype=np.float32)
+        if "time" in df:
+            array["time"] = pd.to_numeric(df["time"], errors='coerce').to_numpy(dtype=np.float32)
+        else:
+            array["time"] = np.nan
+        array["scouts"] = df["scouts"].to_numpy(dtype=np.int8) if "scouts" in df else 1
+        return cls(array)
+
+    @classmethod
+    def from_json(cls, event_json):
+        events = json.loads(event_json)
+        if len(events) == 0:
+            return cls.empty()
+        return cls.from_dataframe(pd.json_normalize(events))
+
+    def __len__(self):
+        return self.array.shape[0]
+
+    @property
+    def names(self):
+        return _EVENT_NAMES[self.array["code"]]
+
+    def to_dataframe(self):
+        # Column layout matches pd.json_normalize of the EventList json
+        return pd.DataFrame({
+            "name": self.names,
+            "npos.x": self.array["x"],
+            "npos.y": self.array["y"],
+            "time": self.array["time"],
+            "scouts": self.array["scouts"],
+        })
+
+    def to_records(self, ids=None, **extra_columns):
+        # List of dicts for the DataTable, built only at the UI edge
+        if ids is None:
+            ids = range(len(self))
+        columns = {
+            "name": self.names.tolist(),
+            "npos.x": np.round(self.array["x"].astype(np.double), 4).tolist(),
+            "npos.y": np.round(self.array["y"].astype(np.double), 4).tolist(),
+            "time": np.round(self.array["time"].astype(np.double), 3).tolist(),
+            "scouts": self.array["scouts"].tolist(),
+        }
+        for name, values in extra_columns.items():
+            columns[name] = list(values)
+        keys = list(columns)
+        return [{"id": int(i), **dict(zip(keys, row))} for i, row in zip(ids, zip(*columns.values()))]
+
+
+######################
+## Parsing
+######################
+def parse_events(event_json, use_cache=True):
+    # One EventList json map -> EventBatch, loaded from the disk cache
+    # when this exact json was parsed before
+    if use_cache:
+        array = event_cache.load(event_json)
+        if array is not None and array.dtype == EVENT_DTYPE:
+            return EventBatch(array)
+
+    batch = EventBatch.from_json(event_json)
+    if use_cache:
+        event_cache.store(event_json, batch.array)
+    return batch
+
+
+def parse_event_list(event_json, use_cache=True):
+    # Flatten one EventList json map into a DataFrame (npos.x, npos.y, ...)
+    return parse_events(event_json, use_cache).to_dataframe()
+
+
+######################
+## Multi-scout reconciliation
+######################
+def reconcile_event_lists(event_lists, tolerance=RECONCILE_TOLERANCE):
+    # Align several scouts' event lists for the same robot by time and
+    # average their positions into one consensus path. The longest list is
+    # used as the reference; every other list is matched to it with a
+    # nearest-time merge on events of the same name.
+    event_lists = [e for e in event_lists if e.shape[0] > 0]
+    if len(event_lists) == 0:
+        return pd.DataFrame()
+    if len(event_lists) == 1:
+        return event_lists[0]
+
+    event_lists = sorted(event_lists, key=lambda e: e.shape[0], reverse=True)
+    ref = event_lists[0].dropna(subset=["time"]).sort_values("time").reset_index(drop=True)
+
+    sum_x = ref["npos.x"].to_numpy(dtype=np.double).copy()
+    sum_y = ref["npos.y"].to_numpy(dtype=np.double).copy()
+    sum_t = ref["time"].to_numpy(dtype=np.double).copy()
+    count = np.ones(ref.shape[0], dtype=np.int64)
+
+    for other in event_lists[1:]:
+        other = other.dropna(subset=["time"])[["name", "time", "npos.x", "npos.y"]]
+        other = other.rename(columns={"npos.x": "other.x", "npos.y": "other.y"})
+        other["other.time"] = other["time"]
+        other = other.sort_values("time")
+
+        merged = pd.merge_asof(ref[["name", "time"]], other, on="time", by="name",
+                               direction="nearest", tolerance=tolerance)
+        matched = merged["other.time"].notna().to_numpy()
+
+        sum_x[matched] += merged["other.x"].to_numpy(dtype=np.double)[matched]
+        sum_y[matched] += merged["other.y"].to_numpy(dtype=np.double)[matched]
+        sum_t[matched] += merged["other.time"].to_numpy(dtype=np.double)[matched]
+        count += matched
+
+    consensus = ref.copy()
+    consensus["npos.x"] = sum_x / count
+    consensus["npos.y"] = sum_y / count
+    consensus["time"] = sum_t / count
+    consensus["scouts"] = count
+    return consensus.sort_values("time", kind="stable").reset_index(drop=True)
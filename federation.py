@@ -0,0 +1,146 @@
+import collections
+import glob
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+######################
+## Database Discovery
+######################
+def discover_databases(spec):
+    # DASHBOARD_DB style spec: one or more paths or glob patterns separated
+    # by os.pathsep, each optionally named as name=path. Each file is one
+    # event, named after the file; AdvantageScout calls every event's file
+    # data_<season>.db, so files with the same name are told apart by their
+    # parent directories (ev1/data_2024, ev2/data_2024).
+    entries = []
+    for part in spec.split(os.pathsep):
+        if part == "":
+            continue
+        name, sep, pattern = part.partition("=")
+        if sep == "" or not re.fullmatch(r"[\w.-]+", name):
+            name, pattern = None, part
+        matched = sorted(glob.glob(pattern))
+        if name is not None and len(matched) > 1:
+            raise ValueError(f"DB name '{name}' matches {len(matched)} files: {', '.join(matched)}")
+        entries += [(name, path) for path in (matched if len(matched) > 0 else [pattern])]
+
+    # The same file listed twice is one event
+    seen = set()
+    unique = []
+    for name, path in entries:
+        real = os.path.realpath(path)
+        if real not in seen:
+            seen.add(real)
+            unique.append((name, path))
+
+    depth = {path: 1 for name, path in unique if name is None}
+    while True:
+        names = [(name or _event_name(path, depth[path]), path) for name, path in unique]
+        counts = collections.Counter(name for name, _ in names)
+        clashing = [path for name, path in names if counts[name] > 1 and path in depth]
+        grown = [path for path in clashing if depth[path] < _depth_limit(path)]
+        if len(grown) == 0:
+            break
+        for path in grown:
+            depth[path] += 1
+
+    duplicates = sorted(name for name, count in counts.items() if count > 1)
+    if len(duplicates) > 0:
+        raise ValueError(f"Several DBs are named {', '.join(duplicates)}; name them explicitly as name=path")
+    return dict(names)
+
+
+def _event_name(path, depth):
+    # file name without extension, prefixed with depth-1 parent directories
+    parts = os.path.normpath(os.path.abspath(path)).split(os.sep)
+    parts[-1] = os.path.splitext(parts[-1])[0]
+    return "/".join(p for p in parts[-depth:] if p != "")
+
+
+def _depth_limit(path):
+    return len(os.path.normpath(os.path.abspath(path)).split(os.sep))
+
+
+######################
+## Federation
+######################
+class Federation:
+    # One SQLite file per event/season, attached to flask_sqlalchemy as
+    # binds. Queries over several events are fanned out on a thread pool and
+    # the results concatenated with an "Event" column.
+
+    def __init__(self, server, db, databases, max_workers=8):
+        self.server = server
+        self.db = db
+        self.databases = databases
+        self.events = list(databases)
+        self.default_event = self.events[0]
+        self.max_workers = max(1, min(max_workers, len(self.events)))
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def configure(server, databases):
+        # Call before SQLAlchemy(server): first DB is the default engine, the
+        # others are binds keyed by event name
+        events = list(databases)
+        server.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{databases[events[0]]}"
+        server.config["SQLALCHEMY_BINDS"] = {event: f"sqlite:///{databases[event]}" for event in events[1:]}
+
+    def selected(self, events):
+        events = [e for e in (events or []) if e in self.databases]
+        return events if len(events) > 0 else [self.default_event]
+
+    def _after_fork(self):
+        # Background callbacks run in forked processes: the parent's pool
+        # threads don't exist there and its pooled SQLite connections must
+        # not be shared, so each process gets its own of both
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                with self.server.app_context():
+                    for engine in self.db.engines.values():
+                        engine.dispose(close=False)
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="federation")
+            self._pid = pid
+
+    @property
+    def pool(self):
+        self._after_fork()
+        return self._pool
+
+    def read_sql(self, query, event=None):
+        if event is None:
+            event = self.default_event
+        self._after_fork()
+        with self.server.app_context():
+            engine = self.db.engines[None if event == self.default_event else event]
+            return pd.read_sql_query(query, con=engine)
+
+    def read_sql_all(self, query, events=None):
+        events = self.selected(events)
+        futures = [(event, self.pool.submit(self.read_sql, query, event)) for event in events]
+        frames = []
+        for event, future in futures:
+            df = future.result()
+            df.insert(0, "Event", event)
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True)
+
+    def version(self, event=None):
+        # Changes whenever the scouting app writes to the event's database
+        stat = os.stat(self.databases[event or self.default_event])
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def versions(self, events=None):
+        if events is None:
+            events = self.events
+        return tuple((event, self.version(event)) for event in events)
@@ -0,0 +1,198 @@
+import functools
+import glob
+import json
+import os
+import re
+import numpy as np
+from geometry import ellipse_arc, path_to_polygon, rect_polygon
+
+######################
+## Settings
+######################
+# One json definition per season: dimensions, npos normalization, shapes
+# and analysis zones. Adding a season means adding a file, not code.
+SEASONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seasons")
+DEFAULT_SEASON = "2024"
+
+
+######################
+## Field Geometry
+######################
+class FieldGeometry:
+
+    def __init__(self, season, definition):
+        self.season = season
+        self.definition = definition
+        self.name = definition.get("name", season)
+        self.width = definition["width"]
+        self.height = definition["height"]
+        npos = definition.get("npos", {})
+        self.x_scale = npos.get("x_scale", self.width)
+        self.y_scale = npos.get("y_scale", self.height)
+        self.flip_y = npos.get("flip_y", True)
+        self.colors = definition.get("colors", {})
+        self.shapes = {s["name"]: s for s in definition.get("shapes", [])}
+        self.zones = self._compile_zones(definition.get("zones", []))
+
+    def _color(self, name):
+        return self.colors.get(name, name)
+
+    def _shape_path(self, shape):
+        if shape["type"] == "arc":
+            return ellipse_arc(**shape["arc"])
+        return shape["path"]
+
+    def _compile_zones(self, zones):
+        # Checked in order, the first zone containing a point wins
+        compiled = {}
+        for zone in zones:
+            if "rect" in zone:
+                compiled[zone["name"]] = rect_polygon(*zone["rect"])
+            else:
+                shape = self.shapes[zone["shape"]]
+                if shape["type"] == "rect":
+                    compiled[zone["name"]] = rect_polygon(shape["x0"], shape["y0"], shape["x1"], shape["y1"])
+                else:
+                    compiled[zone["name"]] = path_to_polygon(self._shape_path(shape),
+                                                             close_with=zone.get("close_with", ()))
+        return compiled
+
+    def to_pixels(self, npos_x, npos_y):
+        # Scouting app normalized positions -> field pixel coordinates
+        x = np.asarray(npos_x, dtype=np.double)*self.x_scale
+        if self.flip_y:
+            y = (1-np.asarray(npos_y, dtype=np.double))*self.y_scale
+        else:
+            y = np.asarray(npos_y, dtype=np.double)*self.y_scale
+        return x, y
+
+    def mirror_x(self, x):
+        return self.width - np.asarray(x, dtype=np.double)
+
+    def plotly_shapes(self, lwidth=3, glayer='below'):
+        shapes = []
+        for shape in self.shapes.values():
+            if shape["type"] in ("rect", "line"):
+                shapes.append(dict(
+                    type=shape["type"], x0=shape["x0"], y0=shape["y0"], x1=shape["x1"], y1=shape["y1"],
+                    line=dict(color=self._color(shape.get("line", "main")), width=lwidth),
+                    layer=glayer
+                ))
+            else:
+                compiled = dict(
+                    type="path",
+                    path=self._shape_path(shape),
+                    line_color=self._color(shape.get("line", "main")),
+                    layer=glayer
+                )
+                if "fill" in shape:
+                    compiled["fillcolor"] = self._color(shape["fill"])
+                shapes.append(compiled)
+        return shapes
+
+    def layout(self, fig_width=None, fig_height=None, margins=30, lwidth=3,
+               labelticks=True, show_axis=True, glayer='below', bg_color='white'):
+        return json.loads(_layout_json(self.season, fig_width or self.width, fig_height or self.height,
+                                       margins, lwidth, labelticks, show_axis, glayer, bg_color))
+
+
+@functools.lru_cache(maxsize=64)
+def _layout_json(season, fig_width, fig_height, margins, lwidth, labelticks, show_axis, glayer, bg_color):
+    # Full Plotly layout for the field, compiled once per season and style
+    field = get_field(season)
+    axis = dict(
+        showgrid=False,
+        zeroline=False,
+        showline=False,
+        ticks='',
+        fixedrange=True,
+        visible=show_axis,
+        showticklabels=labelticks,
+    )
+    layout = dict(
+        showlegend=False,
+        autosize=False,
+        width=fig_width,
+        height=fig_height,
+        margin=dict(l=margins, r=margins, t=margins, b=margins),
+        paper_bgcolor=bg_color,
+        plot_bgcolor=bg_color,
+        xaxis=dict(axis, range=[0, field.width]),
+        yaxis=dict(axis, range=[0, field.height], scaleanchor="x", scaleratio=1),
+        xaxis2=dict(axis),
+        yaxis2=dict(axis, scaleanchor="x2"),
+        shapes=field.plotly_shapes(lwidth=lwidth, glayer=glayer),
+    )
+    return json.dumps(layout)
+
+
+######################
+## Registry
+######################
+_fields = {}
+_active_season = DEFAULT_SEASON
+
+
+def register_field(season, definition):
+    _fields[str(season)] = FieldGeometry(str(season), definition)
+    _layout_json.cache_clear()
+    return _fields[str(season)]
+
+
+def load_seasons(path=SEASONS_DIR):
+    for file in sorted(glob.glob(os.path.join(path, "*.json"))):
+        with open(file) as f:
+            register_field(os.path.splitext(os.path.basename(file))[0], json.load(f))
+    return sorted(_fields)
+
+
+def get_field(season=None):
+    if season is None:
+        season = _active_season
+    return _fields[str(season)]
+
+
+def active_field():
+    return get_field()
+
+
+def set_active_season(season):
+    global _active_season
+    if str(season) not in _fields:
+        raise KeyError(f"No field definition for season {season} in {SEASONS_DIR}")
+    _active_season = str(season)
+
+
+def season_for_db(db_path, default=DEFAULT_SEASON):
+    # Scouting DBs are named data_<season>.db
+    seasons = [s for s in re.findall(r"(\d{4})", os.path.basename(db_path)) if s in _fields]
+    return seasons[-1] if len(seasons) > 0 else default
+
+
+def single_season(databases, season=None):
+    # The active field is process wide, so one process only serves DBs of
+    # one season: `season`, else the first DB's. DBs named after another
+    # season are left out with an error instead of being drawn and
+    # zone-classified on the wrong field; DBs without a season in their name
+    # are taken to be of that season. -> (season, {event: path})
+    named = {event: _named_season(path) for event, path in databases.items()}
+    if season is None:
+        season = next(iter(named.values())) or DEFAULT_SEASON
+    season = str(season)
+    kept = {}
+    for event, path in databases.items():
+        if named[event] is not None and named[event] != season:
+            print(f"ERROR: {event} ({path}) is a {named[event]} DB, this process shows {season} fields; "
+                  f"skipping it. Serve each season from its own process.", flush=True)
+            continue
+        kept[event] = path
+    return season, kept
+
+
+def _named_season(db_path):
+    # Season year in a DB file name, with or without a field definition
+    seasons = re.findall(r"(20\d\d)", os.path.basename(db_path))
+    return seasons[-1] if len(seasons) > 0 else None
+
+
+load_seasons()
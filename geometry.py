@@ -0,0 +1,52 @@
+import functools
+import numpy as np
+
+######################
+## SVG Path Geometry
+######################
+# Decimals kept in generated SVG coordinates; plenty for pixel-sized shapes
+# and keeps the serialized layouts small
+PATH_PRECISION = 2
+
+
+def svg_path(x, y, closed=False, precision=PATH_PRECISION):
+    # "M x0, y0Lx1, y1..." built with vectorized formatting and one join
+    fmt = f'%.{precision}f'
+    points = np.char.add(np.char.add(np.char.mod(fmt, np.asarray(x, dtype=np.double)), ', '),
+                         np.char.mod(fmt, np.asarray(y, dtype=np.double)))
+    path = 'M ' + 'L'.join(points.tolist())
+    if closed:
+        path += ' Z'
+    return path
+
+
+# From: https://community.plot.ly/t/arc-shape-with-path/7205/5
+@functools.lru_cache(maxsize=None)
+def ellipse_arc(x_center=0.0, y_center=0.0, a=10.5, b=10.5,
+                start_angle=0.0, end_angle=2 * np.pi, N=200,
+                closed=False, opposite=False):
+    # Memoized: every court/field draw with the same arc reuses the string
+    t = np.linspace(start_angle, end_angle, N)
+    x = x_center + a * np.cos(t)
+    if opposite:
+        y = y_center + b * np.sin(-t)
+    else:
+        y = y_center + b * np.sin(t)
+    return svg_path(x, y, closed=closed)
+
+
+######################
+## Polygons
+######################
+def path_to_polygon(path, close_with=()):
+    # " M x y L x y ... [Z]" -> (n, 2) vertices. Open paths (e.g. a line
+    # cutting off a field corner) are closed through the given point(s).
+    tokens = path.replace("M", " ").replace("L", " ").replace("Z", " ").replace(",", " ").split()
+    vertices = np.array(tokens, dtype=np.double).reshape(-1, 2)
+    if len(close_with) > 0:
+        vertices = np.vstack([vertices, np.array(close_with, dtype=np.double).reshape(-1, 2)])
+    return vertices
+
+
+def rect_polygon(x0, y0, x1, y1):
+    return np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], dtype=np.double)
@@ -0,0 +1,11 @@
+import multiprocessing
+import os
+
+bind = os.environ.get("DASHBOARD_BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("DASHBOARD_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("DASHBOARD_THREADS", 4))
+worker_class = "gthread"
+timeout = 120
+
+# Each worker imports the app itself so no SQLite connection crosses a fork
+preload_app = False
@@ -0,0 +1,131 @@
+import gzip
+import hashlib
+import os
+import flask
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+######################
+## Settings
+######################
+# Callback responses smaller than this are sent as they are
+COMPRESS_MIN_SIZE = int(os.environ.get("DASHBOARD_COMPRESS_MIN_SIZE", 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Dash links every asset as ?m=<file mtime>, so a stamped URL gets new
+# content only under a new stamp and browsers may keep it. The mtime stands
+# in for a content hash; the ETag is the content hash.
+ASSET_MAX_AGE = 365*24*3600
+
+# Dash endpoints whose JSON responses get compressed
+COMPRESSED_ENDPOINTS = ("_dash-update-component", "_dash-layout", "_dash-dependencies")
+
+# Content hash per asset file, keyed by (path, mtime, size)
+_asset_hashes = {}
+
+
+######################
+## Helper Functions
+######################
+def accepted_encoding(accept_encoding):
+    # Best encoding both sides support, or None
+    accepted = [part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")]
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def asset_hash(path):
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    digest = _asset_hashes.get(key)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:16]
+        _asset_hashes[key] = digest
+    return digest
+
+
+######################
+## Response hooks
+######################
+def install(app):
+    # Production HTTP behaviour: compressed callback JSON, ETags on the
+    # layout and long-lived caching for mtime-stamped assets
+    server = app.server
+    if server.extensions.get("http_cache"):
+        return server
+    server.extensions["http_cache"] = True
+
+    prefix = app.config.requests_pathname_prefix
+    assets_prefix = f"{prefix}{app.config.assets_url_path.strip('/')}/"
+
+    @server.after_request
+    def http_cache_headers(response):
+        request = flask.request
+        path = request.path
+
+        if path.startswith(assets_prefix):
+            return asset_headers(app, request, response, path[len(assets_prefix):])
+
+        endpoint = path[len(prefix):] if path.startswith(prefix) else path.lstrip("/")
+        if endpoint not in COMPRESSED_ENDPOINTS or response.status_code != 200 or response.direct_passthrough:
+            return response
+
+        if endpoint == "_dash-layout":
+            # Layout is rebuilt per request but rarely changes: revalidate
+            # with an ETag of the uncompressed body
+            response.add_etag()
+            response.headers["Cache-Control"] = "no-cache"
+            response.make_conditional(request)
+            if response.status_code != 200:
+                return response
+
+        return compress_response(request, response)
+
+    return server
+
+
+def asset_headers(app, request, response, asset):
+    if response.status_code not in (200, 304):
+        return response
+    path = os.path.join(app.config.assets_folder, *asset.split("/"))
+    if not os.path.isfile(path):
+        return response
+
+    response.set_etag(asset_hash(path))
+    if request.args.get("m"):
+        response.headers["Cache-Control"] = f"public, max-age={ASSET_MAX_AGE}, immutable"
+    else:
+        response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+
+def compress_response(request, response):
+    response.vary.add("Accept-Encoding")
+    if "Content-Encoding" in response.headers:
+        return response
+    encoding = accepted_encoding(request.headers.get("Accept-Encoding"))
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    response.headers["Content-Length"] = str(len(response.get_data()))
+    return response
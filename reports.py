@@ -0,0 +1,224 @@
+# Batch export of every team's scouted paths for printed pit-scouting packets:
+#
+#   python reports.py --out reports --stage Auto --format pdf
+#
+# The field background is drawn once with Pillow; every (team, match, stage)
+# image is a copy of it with the path drawn on top, rendered in a process
+# pool. Each team gets an HTML page and/or a PDF with one page per match.
+
+import argparse
+import functools
+import html
+import io
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageDraw
+
+import fields
+from events import parse_event_list
+from federation import discover_databases
+from geometry import path_to_polygon
+
+######################
+## Settings
+######################
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "AdvantageScout", "data_2024.db")
+STAGE_TABLES = {"Auto": "AutoEventList", "Teleop": "TeleEventList"}
+
+# Image pixels per field unit, and white border around the field
+SCALE = 2
+MARGIN = 20
+TITLE_HEIGHT = 24
+
+# Dashboard event colors, with the ones that vanish on white paper darkened
+EVENT_COLORS = {
+    "scoreSpeaker": "#00AA00",
+    "missSpeaker": "red",
+    "scoreAmp": "blue",
+    "missAmp": "purple",
+    "move": "#888888",
+    "pickup": "orange",
+    "drop": "black",
+    "init": "#00AAAA",
+}
+PATH_COLOR = "#888888"
+MARKER_RADIUS = 5
+
+
+######################
+## Field background
+######################
+def image_xy(field, x, y):
+    # field coordinates (y up) -> image pixels (y down)
+    x = np.asarray(x, dtype=np.double)*SCALE + MARGIN
+    y = (field.height - np.asarray(y, dtype=np.double))*SCALE + MARGIN + TITLE_HEIGHT
+    return x, y
+
+
+def render_background(season):
+    field = fields.get_field(season)
+    image = Image.new("RGB", (field.width*SCALE + 2*MARGIN, field.height*SCALE + 2*MARGIN + TITLE_HEIGHT), "white")
+    draw = ImageDraw.Draw(image)
+
+    for shape in field.shapes.values():
+        color = field._color(shape.get("line", "main"))
+        if shape["type"] in ("rect", "line"):
+            x, y = image_xy(field, [shape["x0"], shape["x1"]], [shape["y0"], shape["y1"]])
+            if shape["type"] == "rect":
+                draw.rectangle([min(x), min(y), max(x), max(y)], outline=color, width=SCALE)
+            else:
+                draw.line(list(zip(x, y)), fill=color, width=SCALE)
+            continue
+
+        path = field._shape_path(shape)
+        x, y = image_xy(field, *path_to_polygon(path).T)
+        points = list(zip(x, y))
+        if path.rstrip().endswith("Z"):
+            fill = field._color(shape["fill"]) if "fill" in shape else None
+            draw.polygon(points, outline=color, fill=fill, width=SCALE)
+        else:
+            draw.line(points, fill=color, width=SCALE)
+    return image
+
+
+@functools.lru_cache(maxsize=None)
+def background(season):
+    return render_background(season)
+
+
+# Backgrounds handed to pool workers by the parent process
+_worker_background = {}
+
+
+def init_worker(season, background_png):
+    fields.set_active_season(season)
+    image = Image.open(io.BytesIO(background_png))
+    image.load()
+    _worker_background[season] = image
+
+
+######################
+## Path images
+######################
+def render_path(season, title, events):
+    # Copy of the field background with one match's path drawn on top
+    field = fields.get_field(season)
+    image = _worker_background[season] if season in _worker_background else background(season)
+    image = image.copy()
+    draw = ImageDraw.Draw(image)
+    draw.text((MARGIN, MARGIN//2), title, fill="black")
+    if events.shape[0] == 0:
+        return image
+
+    events = events.sort_values("time", kind="stable")
+    x, y = image_xy(field, *field.to_pixels(events["npos.x"], events["npos.y"]))
+    keep = ~(np.isnan(x) | np.isnan(y))
+    x, y, names = x[keep], y[keep], events["name"].to_numpy()[keep]
+
+    if x.shape[0] > 1:
+        draw.line(list(zip(x, y)), fill=PATH_COLOR, width=SCALE, joint="curve")
+    r = MARKER_RADIUS
+    for px, py, name in zip(x, y, names):
+        if name == "move":
+            continue
+        draw.ellipse([px-r, py-r, px+r, py+r], fill=EVENT_COLORS.get(name, "gray"), outline="black")
+    return image
+
+
+def render_job(job):
+    season, event, team, match, stage, event_json, out_dir = job
+    title = f"Team {team} - {event} match {match} - {stage}"
+    image = render_path(season, title, parse_event_list(event_json))
+
+    path = os.path.join(out_dir, str(team), f"{event}_{match}_{stage}.png")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    image.save(path, optimize=True)
+    return team, event, match, stage, path
+
+
+######################
+## Data
+######################
+def load_jobs(databases, stages, out_dir, season):
+    # First scouted row of every (event, team, match) per stage
+    jobs = []
+    for event, db_file in databases.items():
+        with sqlite3.connect(db_file) as con:
+            for stage in stages:
+                table = STAGE_TABLES[stage]
+                df = pd.read_sql_query(
+                    f"SELECT Team, Match, {table} FROM match WHERE {table} IS NOT NULL ORDER BY Team, Match, rowid", con)
+                df = df.drop_duplicates(["Team", "Match"])
+                jobs += [(season, event, team, match, stage, event_json, out_dir)
+                         for team, match, event_json in zip(df["Team"], df["Match"], df[table])]
+    return jobs
+
+
+######################
+## Reports
+######################
+def write_html(out_dir, team, images):
+    rows = "\n".join(
+        f'<figure><img src="{html.escape(os.path.relpath(path, os.path.join(out_dir, str(team))))}">'
+        f'<figcaption>{html.escape(f"{event} match {match} - {stage}")}</figcaption></figure>'
+        for event, match, stage, path in images)
+    with open(os.path.join(out_dir, str(team), "index.html"), "w") as f:
+        f.write(f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Team {team}</title>
+<style>
+body {{ font-family: sans-serif; }}
+figure {{ display: inline-block; margin: 8px; page-break-inside: avoid; }}
+img {{ width: 100%; max-width: 620px; }}
+</style></head>
+<body><h1>Team {team}</h1>
+{rows}
+</body></html>
+""")
+
+
+def write_pdf(out_dir, team, images):
+    pages = [Image.open(path).convert("RGB") for _, _, _, path in images]
+    pages[0].save(os.path.join(out_dir, str(team), f"team_{team}.pdf"), save_all=True, append_images=pages[1:])
+
+
+def export_reports(databases, out_dir, stages=("Auto",), formats=("html",), workers=None):
+    season, databases = fields.single_season(databases)
+    fields.set_active_season(season)
+    jobs = load_jobs(databases, stages, out_dir, season)
+
+    # Render the background once and hand it to every worker
+    buffer = io.BytesIO()
+    background(season).save(buffer, format="PNG")
+
+    by_team = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(season, buffer.getvalue())) as pool:
+        for team, event, match, stage, path in pool.map(render_job, jobs, chunksize=16):
+            by_team.setdefault(team, []).append((event, match, stage, path))
+
+    for team, images in by_team.items():
+        if "html" in formats:
+            write_html(out_dir, team, images)
+        if "pdf" in formats:
+            write_pdf(out_dir, team, images)
+    print(f"Rendered {len(jobs)} paths for {len(by_team)} teams into {out_dir}", flush=True)
+    return by_team
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render every team's scouted paths into per-team reports")
+    parser.add_argument("--db", default=os.environ.get("DASHBOARD_DB", DEFAULT_DB),
+                        help="event DB paths/globs, optionally name=path, separated by os.pathsep (same as DASHBOARD_DB)")
+    parser.add_argument("--out", default="reports")
+    parser.add_argument("--stage", choices=["Auto", "Teleop", "both"], default="Auto")
+    parser.add_argument("--format", choices=["html", "pdf", "both"], default="both")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    export_reports(discover_databases(args.db), args.out,
+                   stages=["Auto", "Teleop"] if args.stage == "both" else [args.stage],
+                   formats=["html", "pdf"] if args.format == "both" else [args.format],
+                   workers=args.workers)
@@ -0,0 +1,236 @@
+import collections
+import re
+import threading
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from events import parse_events, EVENT_TYPES, EVENT_CODES
+
+######################
+## Settings
+######################
+# Longest n-gram stored in the index; longer patterns are answered from the
+# postings of their first MAX_N events and checked against the sequence
+MAX_N = 4
+STAGE_TABLES = {"Auto": "AutoEventList", "Teleop": "TeleEventList"}
+# Pattern token matching any number of events in between
+GAP = "*"
+
+RESULT_COLUMNS = ["Team", "Match", "Stage", "start", "end"]
+
+# n-gram key: one 4 bit nibble per event, code+2 so no event maps to 0 and
+# n-grams of different length never share a key
+_NIBBLE = 4
+_SHIFTS = np.arange(MAX_N, dtype=np.int64)*_NIBBLE
+
+
+def ngram_keys(codes, n):
+    windows = sliding_window_view(np.asarray(codes, dtype=np.int64)+2, n)
+    return (windows << _SHIFTS[:n]).sum(axis=1)
+
+
+######################
+## Pattern parsing
+######################
+def parse_pattern(text):
+    # "pickup > move > scoreAmp in auto", "missSpeaker * pickup within 3"
+    # -> (event names with GAP tokens, max seconds or None, stage or None)
+    within = None
+    stage = None
+    match = re.search(r"\bwithin\s+([0-9.]+)\s*s?\b", text, re.IGNORECASE)
+    if match:
+        within = float(match.group(1))
+        text = text[:match.start()] + text[match.end():]
+    match = re.search(r"\bin\s+(auto|teleop)\b", text, re.IGNORECASE)
+    if match:
+        stage = "Auto" if match.group(1).lower() == "auto" else "Teleop"
+        text = text[:match.start()] + text[match.end():]
+
+    names = {name.lower(): name for name in EVENT_TYPES}
+    pattern = []
+    for token in re.split(r"[\s,>→]+|->", text):
+        if token == "":
+            continue
+        if token in (GAP, "..."):
+            pattern.append(GAP)
+        elif token.lower() in names:
+            pattern.append(names[token.lower()])
+        else:
+            raise ValueError(f"Unknown event type '{token}', expected one of {', '.join(EVENT_TYPES)}")
+    while len(pattern) > 0 and pattern[-1] == GAP:
+        pattern.pop()
+    while len(pattern) > 0 and pattern[0] == GAP:
+        pattern.pop(0)
+    return pattern, within, stage
+
+
+######################
+## Event Sequence Index
+######################
+# One consistent version of the index. Postings are three parallel arrays
+# (key, doc, position) sorted by key; per doc: (Team, Match, Stage), event
+# codes and times in time order, None once its row was edited or deleted.
+IndexState = collections.namedtuple("IndexState", ["docs", "codes", "times", "keys", "post_doc", "post_pos"])
+
+EMPTY_STATE = IndexState([], [], [], np.zeros(0, dtype=np.int64),
+                         np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32))
+
+
+class EventSequenceIndex:
+    # Inverted index of event-type n-grams (1..MAX_N) over every EventList
+    # row in one scouting database; a lookup is a searchsorted on the keys.
+    # A refresh reads the rows' text (cheap) and compares a fingerprint per
+    # rowid: only new or edited rows are parsed and indexed, and the postings
+    # of edited or deleted rows are dropped. It builds a new IndexState and
+    # swaps it in with one assignment, so queries never take the lock.
+
+    def __init__(self, read_sql, version):
+        self.read_sql = read_sql
+        self.version = version
+        self.data_version = None
+        self._lock = threading.Lock()
+        self.state = EMPTY_STATE
+        # rowid -> (fingerprint, doc ids), only touched under _lock
+        self.rows = {}
+        self.live_docs = 0
+
+    def _add_rows(self, state, rows):
+        # rows: [(rowid, fingerprint, Team, Match, AutoEventList, TeleEventList)]
+        # -> new IndexState; `state` is left untouched
+        docs, codes, times = list(state.docs), list(state.codes), list(state.times)
+        keys = [state.keys]
+        post_doc = [state.post_doc]
+        post_pos = [state.post_pos]
+        for row_id, fingerprint, team, match, *event_jsons in rows:
+            row_docs = []
+            for stage, event_json in zip(STAGE_TABLES, event_jsons):
+                if pd.isna(event_json) or pd.isna(team):
+                    continue
+                array = parse_events(event_json).array
+                array = array[np.argsort(array["time"], kind="stable")]
+                doc = len(docs)
+                row_docs.append(doc)
+                docs.append((team, match, stage))
+                codes.append(np.asarray(array["code"], dtype=np.int8))
+                times.append(np.asarray(array["time"], dtype=np.float32))
+
+                for n in range(1, min(MAX_N, array.shape[0])+1):
+                    doc_keys = ngram_keys(array["code"], n)
+                    keys.append(doc_keys)
+                    post_doc.append(np.full(doc_keys.shape[0], doc, dtype=np.int32))
+                    post_pos.append(np.arange(doc_keys.shape[0], dtype=np.int32))
+            self.rows[row_id] = (fingerprint, row_docs)
+            self.live_docs += len(row_docs)
+
+        keys = np.concatenate(keys)
+        order = np.argsort(keys, kind="stable")
+        return IndexState(docs, codes, times, keys[order],
+                          np.concatenate(post_doc)[order], np.concatenate(post_pos)[order])
+
+    def _drop_rows(self, state, row_ids):
+        # -> new IndexState without the docs of these rows
+        dead = [doc for row_id in row_ids for doc in self.rows.pop(row_id)[1]]
+        if len(dead) == 0:
+            return state
+        keep = ~np.isin(state.post_doc, dead)
+        docs, codes, times = list(state.docs), list(state.codes), list(state.times)
+        for doc in dead:
+            docs[doc] = None
+            codes[doc] = None
+            times[doc] = None
+        self.live_docs -= len(dead)
+        return IndexState(docs, codes, times, state.keys[keep], state.post_doc[keep], state.post_pos[keep])
+
+    def refresh(self, data_version=None):
+        if data_version is None:
+            data_version = self.version()
+
+        df = self.read_sql("SELECT rowid AS row_id, Team, Match, AutoEventList, TeleEventList FROM match")
+        current = {}
+        for row in zip(df["row_id"], df["Team"], df["Match"], df["AutoEventList"], df["TeleEventList"]):
+            # repr, not the values: NaN never hashes equal to itself
+            current[int(row[0])] = (hash(repr(row[1:])), *row[1:])
+
+        stale = [row_id for row_id, (fingerprint, _) in self.rows.items()
+                 if row_id not in current or current[row_id][0] != fingerprint]
+        new = [row_id for row_id in current if row_id not in self.rows]
+        state = self._drop_rows(self.state, stale)
+        if len(state.docs) - self.live_docs > self.live_docs:
+            # Mostly dead docs: rebuild so they stop taking memory
+            state = EMPTY_STATE
+            self.rows = {}
+            self.live_docs = 0
+            new = list(current)
+        else:
+            new += [row_id for row_id in stale if row_id in current]
+        if len(new) > 0:
+            state = self._add_rows(state, [(row_id, *current[row_id]) for row_id in sorted(new)])
+
+        self.state = state
+        self.data_version = data_version
+
+    def get(self):
+        data_version = self.version()
+        if data_version != self.data_version:
+            with self._lock:
+                if data_version != self.data_version:
+                    self.refresh(data_version)
+        return self
+
+    @staticmethod
+    def _postings(state, segment):
+        # (doc, start position) of every occurrence of a gap-free segment
+        codes = [EVENT_CODES[name] for name in segment]
+        head = codes[:MAX_N]
+        key = ngram_keys(head, len(head))[0]
+        lo, hi = np.searchsorted(state.keys, [key, key+1])
+        doc, pos = state.post_doc[lo:hi], state.post_pos[lo:hi]
+        if len(codes) > MAX_N:
+            tail = np.array(codes[MAX_N:], dtype=np.int8)
+            keep = [np.array_equal(state.codes[d][p+MAX_N:p+len(codes)], tail) for d, p in zip(doc, pos)]
+            doc, pos = doc[keep], pos[keep]
+        return doc, pos
+
+    def query(self, pattern, within=None, stage=None):
+        # Occurrences of the pattern (event names, GAP for "anything in
+        # between"), optionally within `within` seconds from first to last
+        # event. Each gap-separated segment is looked up in the index and
+        # chained to the first following occurrence of the next segment.
+        segments = [[]]
+        for name in pattern:
+            if name == GAP:
+                segments.append([])
+            else:
+                segments[-1].append(name)
+        segments = [s for s in segments if len(s) > 0]
+        state = self.state
+        if len(segments) == 0 or len(state.docs) == 0:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+
+        doc, start = self._postings(state, segments[0])
+        end = start + len(segments[0])
+        span = np.int64(1) << 32
+        for segment in segments[1:]:
+            next_doc, next_pos = self._postings(state, segment)
+            order = np.lexsort((next_pos, next_doc))
+            next_key = next_doc[order].astype(np.int64)*span + next_pos[order]
+            at = np.searchsorted(next_key, doc.astype(np.int64)*span + end)
+            found = at < next_key.shape[0]
+            found[found] = next_doc[order][at[found]] == doc[found]
+            doc, start = doc[found], start[found]
+            end = next_pos[order][at[found]] + len(segment)
+
+        stages = np.array([state.docs[d][2] for d in doc], dtype=object)
+        keep = np.ones(doc.shape[0], dtype=bool) if stage is None else stages == stage
+        t_start = np.array([state.times[d][p] for d, p in zip(doc, start)], dtype=np.double)
+        t_end = np.array([state.times[d][p-1] for d, p in zip(doc, end)], dtype=np.double)
+        if within is not None:
+            keep &= (t_end - t_start) <= within
+
+        return pd.DataFrame({
+            "Team": [state.docs[d][0] for d in doc[keep]],
+            "Match": [state.docs[d][1] for d in doc[keep]],
+            "Stage": stages[keep],
+            "start": t_start[keep],
+            "end": t_end[keep],
+        }, columns=RESULT_COLUMNS)
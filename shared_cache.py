@@ -0,0 +1,165 @@
+import functools
+import hashlib
+import os
+import pickle
+import time
+from event_cache import CACHE_DIR
+from storage import atomic_file
+
+######################
+## Settings
+######################
+# Set DASHBOARD_REDIS_URL to share the cache through Redis (or any server
+# speaking the Redis protocol). Without it every worker on the machine shares
+# a directory of pickled entries instead.
+REDIS_URL = os.environ.get("DASHBOARD_REDIS_URL")
+SHARED_CACHE_DIR = os.path.join(CACHE_DIR, "shared")
+DEFAULT_TIMEOUT = 24*60*60
+
+# File backend limits. Keys embed the DB version, so every upload leaves the
+# previous entries behind; the least recently used ones are evicted once
+# either limit is exceeded. (Redis evicts with its own maxmemory policy.)
+MAX_ENTRIES = int(os.environ.get("DASHBOARD_SHARED_CACHE_ENTRIES", 2000))
+MAX_BYTES = int(os.environ.get("DASHBOARD_SHARED_CACHE_MB", 512))*1024*1024
+# Limits are checked every PRUNE_EVERY writes of a process
+PRUNE_EVERY = 32
+
+
+######################
+## Backends
+######################
+class FileBackend:
+
+    def __init__(self, path=SHARED_CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.writes = 0
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+    def get(self, key):
+        try:
+            with open(self._file(key), "rb") as f:
+                expires, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if expires is not None and expires < time.time():
+            self.delete(key)
+            return None
+        # mtime doubles as the last access time for eviction
+        try:
+            os.utime(self._file(key))
+        except OSError:
+            pass
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        expires = time.time() + timeout if timeout else None
+        with atomic_file(self._file(key)) as f:
+            pickle.dump((expires, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.writes += 1
+        if self.writes % PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        # Drop entries untouched for DEFAULT_TIMEOUT, then the least recently
+        # used ones until the directory is within both limits
+        entries = []
+        for file in os.listdir(self.path):
+            if file.endswith(".tmp"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.path, file))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file))
+        entries.sort()
+
+        now = time.time()
+        count = len(entries)
+        size = sum(e[1] for e in entries)
+        for mtime, file_size, file in entries:
+            if mtime >= now - DEFAULT_TIMEOUT and count <= self.max_entries and size <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.path, file))
+            except OSError:
+                pass
+            count -= 1
+            size -= file_size
+
+    def delete(self, key):
+        try:
+            os.remove(self._file(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        for file in os.listdir(self.path):
+            try:
+                os.remove(os.path.join(self.path, file))
+            except OSError:
+                pass
+
+
+class RedisBackend:
+
+    def __init__(self, url, prefix="frc-path:"):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        return pickle.loads(value)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self.client.set(self.prefix + key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                        ex=timeout or None)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+######################
+## Cache API
+######################
+_backend = None
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        if REDIS_URL:
+            _backend = RedisBackend(REDIS_URL)
+        else:
+            _backend = FileBackend()
+    return _backend
+
+
+def cached(name, version=None):
+    # Memoize a function across all workers. `version` is called on every
+    # lookup and becomes part of the key, so entries computed from an older
+    # database are never returned. Functions that take the data version as
+    # an argument need no `version`.
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = f"{name}:{version() if version else ''}:{args!r}"
+            backend = get_backend()
+            value = backend.get(key)
+            if value is None:
+                value = func(*args)
+                backend.set(key, value)
+            return value
+        return wrapper
+    return decorator
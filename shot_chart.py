@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from fields import active_field
+
+######################
+## Settings
+######################
+SHOT_EVENTS = {"scoreSpeaker": True, "missSpeaker": False}
+# Horizontal distance between hexagon centers, in field pixels
+HEX_SIZE = 20
+
+
+######################
+## Hexbin
+######################
+def hexbin(x, y, made, size=HEX_SIZE):
+    # Bin points into a pointy-top hexagonal grid (same two-lattice scheme
+    # as matplotlib's hexbin). Returns a DataFrame with one row per non-empty
+    # hexagon: center x/y, attempts, makes and accuracy.
+    x = np.asarray(x, dtype=np.double)
+    y = np.asarray(y, dtype=np.double)
+    made = np.asarray(made, dtype=bool)
+    if x.shape[0] == 0:
+        return pd.DataFrame(columns=["x", "y", "attempts", "makes", "accuracy"])
+
+    sx = size
+    sy = size*np.sqrt(3)
+    px = x/sx
+    py = y/sy
+
+    ix1 = np.round(px)
+    iy1 = np.round(py)
+    ix2 = np.floor(px)
+    iy2 = np.floor(py)
+    d1 = (px-ix1)**2 + 3.0*(py-iy1)**2
+    d2 = (px-ix2-0.5)**2 + 3.0*(py-iy2-0.5)**2
+    on_first = d1 < d2
+
+    cx = np.where(on_first, ix1, ix2+0.5)*sx
+    cy = np.where(on_first, iy1, iy2+0.5)*sy
+
+    centers, inverse = np.unique(np.column_stack([cx, cy]), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    attempts = np.bincount(inverse, minlength=centers.shape[0])
+    makes = np.bincount(inverse, weights=made, minlength=centers.shape[0])
+
+    return pd.DataFrame({
+        "x": centers[:, 0],
+        "y": centers[:, 1],
+        "attempts": attempts,
+        "makes": makes.astype(int),
+        "accuracy": makes/attempts,
+    })
+
+
+def shot_events(event_lists):
+    # Field position and outcome of every speaker shot in the event lists
+    xs = []
+    ys = []
+    made = []
+    for events in event_lists:
+        if events.shape[0] == 0 or "name" not in events:
+            continue
+        shots = events[events["name"].isin(list(SHOT_EVENTS))]
+        x, y = active_field().to_pixels(shots["npos.x"], shots["npos.y"])
+        xs.append(x)
+        ys.append(y)
+        made.append(shots["name"].map(SHOT_EVENTS).to_numpy(dtype=bool))
+    if len(xs) == 0:
+        return np.zeros(0), np.zeros(0), np.zeros(0, dtype=bool)
+    return np.concatenate(xs), np.concatenate(ys), np.concatenate(made)
@@ -0,0 +1,152 @@
+# Static snapshot of the dashboard for tablets without a server:
+#
+#   python snapshot.py --out snapshot
+#
+# Open snapshot/index.html straight from disk (or any static host). Every
+# (event, team, match, stage) is a small gzip'd, base64 wrapped .js file
+# loaded on demand with a <script> tag, so it also works from file:// where
+# fetch() is blocked. Re-running only rewrites matches whose EventList changed.
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import numpy as np
+import pandas as pd
+
+import fields
+from events import parse_events, EVENT_TYPES, EVENT_COLORS
+from federation import discover_databases
+from storage import write_atomic
+
+######################
+## Settings
+######################
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "AdvantageScout", "data_2024.db")
+STAGE_TABLES = {"Auto": "AutoEventList", "Teleop": "TeleEventList"}
+VIEWER_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot_viewer.html")
+
+# Bump when the per-match payload changes so every match is re-exported
+FORMAT_VERSION = "1"
+MANIFEST = "manifest.json"
+
+
+######################
+## Helper Functions
+######################
+def js_payload(call, payload):
+    # window.snapshot.<call>(...) wrapping gzip'd json as base64
+    data = json.dumps(payload, separators=(",", ":"), allow_nan=False)
+    packed = base64.b64encode(gzip.compress(data.encode("utf-8"), mtime=0))
+    return f'window.snapshot.{call}({packed.decode("ascii")!r});\n'.encode("utf-8")
+
+
+def match_file(event, team, match, stage):
+    return f"data/{event}/{team}_{match}_{stage}.js"
+
+
+def json_floats(values, decimals):
+    # Rounded floats with NaN as None (null): browsers reject NaN in JSON
+    values = np.round(np.asarray(values, dtype=np.double), decimals)
+    return [None if v != v else v for v in values.tolist()]
+
+
+def match_payload(field, event_json):
+    # Events in field pixels, in time order, as parallel arrays
+    array = parse_events(event_json).array
+    array = array[np.argsort(array["time"], kind="stable")]
+    x, y = field.to_pixels(array["x"], array["y"])
+    return {
+        "code": array["code"].tolist(),
+        "x": json_floats(x, 1),
+        "y": json_floats(y, 1),
+        "t": json_floats(array["time"], 2),
+    }
+
+
+######################
+## Export
+######################
+def load_rows(db_file, stage):
+    # First scouted row of every (team, match)
+    table = STAGE_TABLES[stage]
+    with sqlite3.connect(db_file) as con:
+        df = pd.read_sql_query(
+            f"SELECT Team, Match, {table} FROM match WHERE {table} IS NOT NULL ORDER BY Team, Match, rowid", con)
+    return df.drop_duplicates(["Team", "Match"]).rename(columns={table: "EventList"})
+
+
+def export_snapshot(databases, out_dir, stages=("Auto", "Teleop")):
+    season, databases = fields.single_season(databases)
+    fields.set_active_season(season)
+    field = fields.active_field()
+
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    catalog = {}
+    new_manifest = {}
+    written = 0
+    for event, db_file in databases.items():
+        for stage in stages:
+            df = load_rows(db_file, stage)
+            for team, match, event_json in zip(df["Team"], df["Match"], df["EventList"]):
+                team, match = str(team), str(match)
+                file = match_file(event, team, match, stage)
+                digest = hashlib.sha1((FORMAT_VERSION + event_json).encode("utf-8")).hexdigest()
+                catalog.setdefault(team, {}).setdefault(f"{event}:{match}", {})[stage] = file
+                new_manifest[file] = digest
+                if manifest.get(file) == digest and os.path.exists(os.path.join(out_dir, file)):
+                    continue
+                write_atomic(os.path.join(out_dir, file),
+                             js_payload("loaded", {"file": file, "events": match_payload(field, event_json)}))
+                written += 1
+
+    # Matches that disappeared from the DBs
+    for file in set(manifest) - set(new_manifest):
+        try:
+            os.remove(os.path.join(out_dir, file))
+        except OSError:
+            pass
+
+    write_atomic(os.path.join(out_dir, "data", "catalog.js"), js_payload("catalog", {
+        "season": field.name,
+        "events": list(databases),
+        "teams": catalog,
+        "names": EVENT_TYPES,
+        "colors": EVENT_COLORS,
+        "layout": field.layout(show_axis=False, labelticks=False, margins=0, bg_color="black"),
+    }))
+    write_plotlyjs(out_dir)
+    shutil.copyfile(VIEWER_TEMPLATE, os.path.join(out_dir, "index.html"))
+    write_atomic(manifest_path, json.dumps(new_manifest, indent=1, sort_keys=True).encode("utf-8"))
+
+    print(f"Snapshot: {written} of {len(new_manifest)} matches exported to {out_dir}", flush=True)
+    return written
+
+
+def write_plotlyjs(out_dir):
+    # Bundle plotly.js so the viewer needs no network either
+    path = os.path.join(out_dir, "plotly.min.js")
+    if os.path.exists(path):
+        return
+    from plotly.offline import get_plotlyjs
+    write_atomic(path, get_plotlyjs().encode("utf-8"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a static, serverless snapshot of the dashboard")
+    parser.add_argument("--db", default=os.environ.get("DASHBOARD_DB", DEFAULT_DB),
+                        help="event DB paths/globs, optionally name=path, separated by os.pathsep (same as DASHBOARD_DB)")
+    parser.add_argument("--out", default="snapshot")
+    args = parser.parse_args()
+
+    export_snapshot(discover_databases(args.db), args.out)
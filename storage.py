@@ -0,0 +1,78 @@
+import collections
+import contextlib
+import os
+import tempfile
+import threading
+import numpy as np
+
+
+######################
+## Atomic writes
+######################
+@contextlib.contextmanager
+def atomic_file(path):
+    # Binary file handle whose content replaces `path` only once the block
+    # finishes, so concurrent workers never see a partially written file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_atomic(path, data):
+    with atomic_file(path) as f:
+        f.write(data)
+
+
+######################
+## Arrays
+######################
+def save_array(path, array):
+    with atomic_file(path) as f:
+        np.save(f, array, allow_pickle=False)
+
+
+def load_array(path):
+    # Whole array read into memory, or None when missing or unreadable. Not
+    # memory-mapped: every open map would hold a file descriptor.
+    try:
+        return np.load(path, allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+
+
+class LRU:
+    # Thread-safe dict of at most max_entries items, least recently used
+    # dropped first
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
@@ -0,0 +1,152 @@
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+# Keep the event parse cache out of the real cache directory
+os.environ["PATH_DASHBOARD_CACHE"] = tempfile.mkdtemp()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from events import EVENT_CODES
+from sequence_index import EventSequenceIndex, GAP, MAX_N, ngram_keys, parse_pattern
+
+
+def event_list(*names):
+    return json.dumps([{"name": name, "npos": {"x": 0.1, "y": 0.2}, "time": float(t)}
+                       for t, name in enumerate(names, start=1)])
+
+
+class ScoutDB:
+    # In-memory match table plus the version counter the index polls
+    def __init__(self):
+        self.con = sqlite3.connect(":memory:", check_same_thread=False)
+        self.lock = threading.Lock()
+        self.con.execute("CREATE TABLE match (Team INTEGER, Match INTEGER, AutoEventList TEXT, TeleEventList TEXT)")
+        self.version = 0
+
+    def execute(self, sql, *args):
+        with self.lock:
+            self.con.execute(sql, args)
+            self.version += 1
+
+    def read_sql(self, query):
+        with self.lock:
+            return pd.read_sql_query(query, self.con)
+
+    def index(self):
+        return EventSequenceIndex(self.read_sql, lambda: self.version)
+
+
+def teams(index, text):
+    return sorted(index.get().query(*parse_pattern(text))["Team"].tolist())
+
+
+@pytest.fixture
+def db():
+    db = ScoutDB()
+    db.execute("INSERT INTO match VALUES (?, ?, ?, ?)", 1, 1,
+               event_list("init", "pickup", "move", "scoreAmp"), event_list("pickup", "scoreSpeaker"))
+    db.execute("INSERT INTO match VALUES (?, ?, ?, ?)", 2, 1,
+               event_list("init", "missSpeaker", "move", "pickup"), None)
+    return db
+
+
+def test_ngram_keys_pack_one_nibble_per_event():
+    codes = [EVENT_CODES["pickup"], EVENT_CODES["move"]]
+    assert ngram_keys(codes, 2).tolist() == [(codes[0]+2) + ((codes[1]+2) << 4)]
+    # A 1-gram never collides with a longer n-gram starting with the same event
+    assert ngram_keys(codes, 1)[0] != ngram_keys(codes, 2)[0]
+
+
+def test_parse_pattern():
+    assert parse_pattern("pickup > move -> scoreAmp in auto") == (["pickup", "move", "scoreAmp"], None, "Auto")
+    assert parse_pattern("* missSpeaker ... pickup * within 3s") == (["missSpeaker", GAP, "pickup"], 3.0, None)
+    with pytest.raises(ValueError):
+        parse_pattern("pickup > teleport")
+
+
+def test_consecutive_pattern(db):
+    result = db.index().get().query(*parse_pattern("pickup > move > scoreAmp in auto"))
+    assert result[["Team", "Stage", "start", "end"]].values.tolist() == [[1, "Auto", 2.0, 4.0]]
+
+
+def test_pattern_longer_than_max_n(db):
+    names = ["init", "pickup", "move", "scoreAmp"]
+    assert len(names) >= MAX_N
+    index = db.index()
+    assert teams(index, " > ".join(names)) == [1]
+    assert teams(index, " > ".join(names + ["pickup"])) == []
+
+
+def test_gap_chaining_and_filters(db):
+    index = db.index()
+    assert teams(index, "init * pickup") == [1, 2]
+    assert teams(index, "missSpeaker * pickup within 2") == [2]
+    assert teams(index, "missSpeaker * pickup within 1") == []
+    assert teams(index, "pickup in teleop") == [1]
+
+
+def test_refresh_reindexes_edited_rows(db):
+    index = db.index()
+    assert teams(index, "pickup in teleop") == [1]
+
+    # Edit an existing row and append a new one between two refreshes
+    db.execute("UPDATE match SET TeleEventList = ? WHERE Team = 2", event_list("move", "pickup"))
+    db.execute("INSERT INTO match VALUES (?, ?, ?, ?)", 3, 2, None, event_list("pickup", "drop"))
+    assert teams(index, "pickup in teleop") == [1, 2, 3]
+
+    db.execute("UPDATE match SET AutoEventList = ? WHERE Team = 1", event_list("init", "drop"))
+    assert teams(index, "pickup > move > scoreAmp") == []
+    assert teams(index, "init > drop") == [1]
+
+
+def test_refresh_drops_deleted_rows(db):
+    index = db.index()
+    assert teams(index, "init") == [1, 2]
+    db.execute("DELETE FROM match WHERE Team = 1")
+    assert teams(index, "init") == [2]
+    assert teams(index, "pickup in teleop") == []
+    state = index.state
+    assert all(np.isin(state.post_doc, [d for d, doc in enumerate(state.docs) if doc is not None]))
+
+
+def test_query_during_refresh(db):
+    # Readers never take the lock, so they must only ever see a whole state
+    for team in range(3, 40):
+        db.execute("INSERT INTO match VALUES (?, ?, ?, ?)", team, 1, event_list("move", "drop"), None)
+    index = db.index().get()
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    errors = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            try:
+                result = index.query(*parse_pattern("init * pickup"))
+                assert set(result["Team"]) <= {1, 2}
+            except Exception as e:
+                errors.append(e)
+                return
+
+    try:
+        readers = [threading.Thread(target=read, daemon=True) for _ in range(3)]
+        for reader in readers:
+            reader.start()
+        for i in range(100):
+            names = ("init", "pickup") if i % 2 else ("init", "move", "drop", "pickup")
+            db.execute("UPDATE match SET AutoEventList = ? WHERE Team = 2", event_list(*names))
+            index.get()
+        done.set()
+        for reader in readers:
+            reader.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert errors == []
+    assert teams(index, "init * pickup") == [1, 2]
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import numpy as np
+from event_cache import CACHE_DIR
+from events import parse_events
+from fields import active_field
+from storage import LRU, load_array, save_array
+
+######################
+## Settings
+######################
+# Every path is interpolated to the robot position every TIME_STEP seconds
+# over the whole stage, so paths from different matches line up sample by
+# sample (151 samples for auto, both ends included)
+TIME_STEP = 0.1
+STAGE_DURATIONS = {"Auto": 15.0, "Teleop": 135.0}
+TIMEBASE_CACHE_DIR = os.path.join(CACHE_DIR, "timebase")
+
+# Bump when the resampling changes so stale files are ignored
+FORMAT_VERSION = "1"
+
+# Paths kept in this process, keyed by content hash, least recently used
+# dropped first (an auto path is ~1 KB, a teleop path ~11 KB)
+MAX_LOADED = int(os.environ.get("PATH_DASHBOARD_TIMEBASE_LRU", 4096))
+
+_loaded = LRU(MAX_LOADED)
+
+
+######################
+## Helper Functions
+######################
+def time_grid(stage, step=TIME_STEP):
+    duration = STAGE_DURATIONS[stage]
+    return np.arange(int(round(duration/step))+1, dtype=np.double)*step
+
+
+def _key(event_json, stage, step):
+    field = active_field()
+    header = f"{FORMAT_VERSION}:{stage}:{step}:{field.season}:"
+    return hashlib.sha1((header + event_json).encode("utf-8")).hexdigest()
+
+
+def _path(key):
+    return os.path.join(TIMEBASE_CACHE_DIR, key[:2], f"{key}.npy")
+
+
+######################
+## Resampling
+######################
+def resample_in_time(batch, stage, step=TIME_STEP):
+    # EventBatch -> float32 (T, 2) field positions on time_grid(stage). The
+    # robot holds its first position before the first event and its last
+    # position after the last one. NaN when the match has no positions.
+    grid = time_grid(stage, step)
+    array = batch.array
+    t = array["time"].astype(np.double)
+    x, y = active_field().to_pixels(array["x"], array["y"])
+    valid = ~(np.isnan(t) | np.isnan(x) | np.isnan(y))
+    if not valid.any():
+        return np.full((grid.shape[0], 2), np.nan, dtype=np.float32)
+
+    t, x, y = t[valid], x[valid], y[valid]
+    order = np.argsort(t, kind="stable")
+    t, x, y = t[order], x[order], y[order]
+    return np.column_stack([np.interp(grid, t, x), np.interp(grid, t, y)]).astype(np.float32)
+
+
+def timed_path(event_json, stage, step=TIME_STEP):
+    # Cached resample_in_time of one EventList json, read from disk after
+    # the first computation in any worker
+    key = _key(event_json, stage, step)
+    path = _loaded.get(key)
+    if path is not None:
+        return path
+
+    file = _path(key)
+    if os.path.exists(file):
+        path = load_array(file)
+    if path is None:
+        path = resample_in_time(parse_events(event_json), stage, step)
+        save_array(file, path)
+    _loaded.put(key, path)
+    return path
+
+
+def timed_paths(event_jsons, stage, step=TIME_STEP):
+    # (matches, T, 2) float32 stack of timed paths
+    paths = [timed_path(event_json, stage, step) for event_json in event_jsons]
+    if len(paths) == 0:
+        return np.zeros((0, time_grid(stage, step).shape[0], 2), dtype=np.float32)
+    return np.stack(paths)
+
@@ -0,0 +1,18 @@
+# Production entry point, serves the dashboard with several worker processes:
+#
+#   gunicorn -c gunicorn.conf.py "wsgi:create_server()"
+#
+# Workers share parsed events through the .npy files in cache/events
+# and query results through shared_cache (a cache directory, or Redis when
+# DASHBOARD_REDIS_URL is set).
+#
+# Callback JSON is gzip/brotli compressed and assets/layout get caching
+# headers, see http_cache.
+
+def create_server():
+    import http_cache
+    from dashboard8 import app
+    return http_cache.install(app)
+
+
+server = create_server()
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+from fields import active_field
+
+OUTSIDE = "Outside"
+
+
+######################
+## Zone Classification
+######################
+def points_in_polygon(x, y, polygon):
+    # Even-odd ray casting for all points against all edges at once
+    xi = polygon[:, 0][None, :]
+    yi = polygon[:, 1][None, :]
+    xj = np.roll(polygon[:, 0], 1)[None, :]
+    yj = np.roll(polygon[:, 1], 1)[None, :]
+    x = np.asarray(x, dtype=np.double)[:, None]
+    y = np.asarray(y, dtype=np.double)[:, None]
+
+    crosses = (yi > y) != (yj > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = (xj-xi)*(y-yi)/(yj-yi) + xi
+    return np.logical_xor.reduce(crosses & (x < x_cross), axis=1)
+
+
+def classify_zones(x, y, zones=None):
+    # Zone name per point, using the active season's zones by default
+    if zones is None:
+        zones = active_field().zones
+    x = np.asarray(x, dtype=np.double)
+    y = np.asarray(y, dtype=np.double)
+    names = np.array(list(zones) + [OUTSIDE], dtype=object)
+    zone_idx = np.full(x.shape[0], len(zones))
+    for i, polygon in reversed(list(enumerate(zones.values()))):
+        zone_idx[points_in_polygon(x, y, polygon)] = i
+    return names[zone_idx]
+
+
+def zone_summary(events):
+    # Time and events per zone for one match. The robot is counted as being
+    # in an event's zone until the next event.
+    columns = ["zone", "seconds", "fraction", "events"]
+    if events is None or events.shape[0] == 0:
+        return pd.DataFrame(columns=columns)
+
+    field = active_field()
+    events = events.sort_values("time", kind="stable")
+    x, y = field.to_pixels(events["npos.x"], events["npos.y"])
+    t = pd.to_numeric(events["time"], errors='coerce').ffill().fillna(0).to_numpy(dtype=np.double)
+
+    zone = classify_zones(x, y, field.zones)
+    dwell = np.append(np.diff(t), 0)
+
+    summary = pd.DataFrame({"zone": zone, "seconds": dwell, "events": 1}).groupby("zone", sort=False).sum()
+    summary = summary.reindex([z for z in list(field.zones) + [OUTSIDE] if z in summary.index]).reset_index()
+    total = summary["seconds"].sum()
+    summary["fraction"] = summary["seconds"]/total if total > 0 else 0.0
+    return summary[columns]